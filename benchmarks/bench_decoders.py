@@ -0,0 +1,35 @@
+"""
+Compare the JSON backends on a synthetic station dump.
+
+    $ python -m benchmarks.bench_decoders
+"""
+import json
+import timeit
+
+from pyradios.decoders import BACKENDS
+from pyradios.decoders import _installed
+from pyradios.decoders import json_decoder
+
+from benchmarks.bench_facets import synthetic_stations
+
+
+def main():
+    stations = synthetic_stations()
+    for station in stations:
+        station.update(
+            name="Station", url="http://example.org/stream", votes=10,
+            bitrate=128, lastcheckok=1, clickcount=3,
+        )
+    document = json.dumps(stations).encode()
+    print("{} stations, {:.1f} MB".format(len(stations), len(document) / 1e6))
+    for backend in BACKENDS:
+        if not _installed(backend):
+            print("{:<8} not installed".format(backend))
+            continue
+        decode = json_decoder(backend)
+        best = min(timeit.repeat(lambda: decode(document), number=1, repeat=5))
+        print("{:<8} {:8.1f} ms".format(backend, best * 1000))
+
+
+if __name__ == "__main__":
+    main()
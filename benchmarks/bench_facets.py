@@ -0,0 +1,64 @@
+"""
+Compare the facet histogram engine with the former reduce based one.
+
+    $ python -m benchmarks.bench_facets
+"""
+import random
+import timeit
+from collections import defaultdict
+from functools import reduce
+
+from pyradios.facets import RadioFacets
+from pyradios.facets import facet_histogram
+
+
+def synthetic_stations(n=50000, seed=1):
+    rnd = random.Random(seed)
+    tags = ["jazz", "pop", "rock", "news", "talk", "classical", ""]
+    tags += ["tag%d" % i for i in range(3000)]
+    return [
+        {
+            "tags": ",".join(rnd.sample(tags, rnd.randint(0, 5))),
+            "countrycode": rnd.choice(["BE", "NL", "DE", "US", "GB", ""]),
+            "language": rnd.choice(["english", "dutch", "french,german", ""]),
+            "state": rnd.choice(["", "Flanders", "Bavaria"]),
+            "codec": rnd.choice(["MP3", "AAC", "OGG"]),
+        }
+        for _ in range(n)
+    ]
+
+
+def reduce_engine(stations):
+    def facetcount(facets, item):
+        for f in facets.keys():
+            for fv in item[f].split(","):
+                facets[f][fv] += 1
+        return facets
+
+    init = {f: defaultdict(int) for f in RadioFacets.FACETS}
+    hist = reduce(facetcount, stations, init)
+    return {
+        f: sorted(h.items(), key=lambda i: i[1], reverse=True)
+        for f, h in hist.items()
+    }
+
+
+def counter_engine(stations, top=None):
+    return {f: facet_histogram(stations, f, top) for f in RadioFacets.FACETS}
+
+
+def main():
+    stations = synthetic_stations()
+    assert reduce_engine(stations) == counter_engine(stations)
+    runs = [
+        ("reduce", lambda: reduce_engine(stations)),
+        ("counter", lambda: counter_engine(stations)),
+        ("counter top=10", lambda: counter_engine(stations, top=10)),
+    ]
+    for name, fn in runs:
+        best = min(timeit.repeat(fn, number=1, repeat=9))
+        print("{:<16} {:8.1f} ms".format(name, best * 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Compare the compiled `type_check` with the former per-call one.
+
+    $ python -m benchmarks.bench_type_check
+"""
+import timeit
+from functools import wraps
+
+from pyradios.utils import radio_browser_adapter
+from pyradios.utils import type_check
+from pyradios.utils import types
+from pyradios.utils import validate_input
+
+
+def legacy_type_check(func):
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        validate_input(types[func.__name__], kwargs)
+        kwargs = radio_browser_adapter(**kwargs)
+        return func(self, *args, **kwargs)
+
+    return wrapper
+
+
+class Legacy:
+    @legacy_type_check
+    def search(self, **kwargs):
+        return kwargs
+
+
+class Compiled:
+    _validate = True
+
+    @type_check
+    def search(self, **kwargs):
+        return kwargs
+
+
+class Trusted(Compiled):
+    _validate = False
+
+
+KWARGS = dict(
+    tag_list="jazz,blues",
+    countrycode="BE",
+    name_exact=False,
+    hidebroken=True,
+    order="votes",
+    reverse=True,
+    offset=0,
+    limit="100",
+)
+
+
+def main():
+    number = 100000
+    for service in (Legacy(), Compiled(), Trusted()):
+        best = min(
+            timeit.repeat(
+                lambda: service.search(**KWARGS), number=number, repeat=5
+            )
+        )
+        print(
+            "{:<10} {:8.2f} us/call".format(
+                type(service).__name__, best / number * 1e6
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
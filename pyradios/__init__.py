@@ -1,8 +1,9 @@
 import logging
 from logging import NullHandler
+from pyradios.radios import AsyncRadioBrowser
 from pyradios.radios import RadioBrowser
 from pyradios.facets import RadioFacets
 
-__all__ = ["RadioBrowser", "RadioFacets"]
+__all__ = ["AsyncRadioBrowser", "RadioBrowser", "RadioFacets"]
 
 logging.getLogger(__name__).addHandler(NullHandler())
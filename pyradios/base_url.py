@@ -1,13 +1,42 @@
 """
 This module get information about `Radio Browser` servers.
 """
+import asyncio
+import json
 import logging
+import os
 import random
 import socket
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
 
 
 log = logging.getLogger("pyradios")
 
+# seconds to wait for a single reverse dns lookup
+LOOKUP_TIMEOUT = 2.0
+
+# seconds to wait for all reverse dns lookups together
+DISCOVERY_DEADLINE = 5.0
+
+# seconds a discovered list of mirrors is considered fresh
+CACHE_TTL = 60 * 60
+
+CACHE_FILE = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+    "pyradios",
+    "hosts.json",
+)
+
+_cache = {"hosts": [], "expires": 0.0}
+_cache_lock = threading.Lock()
+
+# one discovery at a time per event loop, see `async_cached_hosts`
+_async_locks = weakref.WeakKeyDictionary()
+
 
 class Error(Exception):
     """Base class for all exceptions raised by this module."""
@@ -61,21 +90,249 @@ def rdns_lookup(ip):
     return hostname
 
 
-def fetch_hosts():
-    names = []
+def fetch_hosts(timeout=LOOKUP_TIMEOUT, deadline=DISCOVERY_DEADLINE):
+    """
+    Resolve the hostnames of all `Radio Browser` servers.
+
+    The reverse lookups run concurrently, one thread per IP, so discovery
+    takes as long as the slowest lookup, bounded by `deadline`. Lookups
+    that did not finish in time are dropped.
+
+    Args:
+        timeout (float, optional): Seconds to wait for a single lookup.
+        deadline (float, optional): Seconds to wait for all lookups.
+
+    Returns:
+        list: List of hostnames
+    """
     servers = fetch_servers()
+    if not servers:
+        return []
+
+    executor = ThreadPoolExecutor(
+        max_workers=len(servers), thread_name_prefix="pyradios-rdns"
+    )
+    try:
+        futures = [executor.submit(rdns_lookup, ip) for ip in servers]
+        # all lookups start at once, so neither bound can be exceeded
+        done, _ = wait(futures, timeout=min(timeout, deadline))
+        names = []
+        for ip, future in zip(servers, futures):
+            if future not in done:
+                log.warning("Reverse dns lookup for ip %s timed out", ip)
+                continue
+            try:
+                names.append(future.result())
+            except RDNSLookupError as exc:
+                log.exception(exc.error_msg)
+        return names
+    finally:
+        # never block on a hanging resolver
+        executor.shutdown(wait=False, cancel_futures=True)
+
 
-    for ip in servers:
+async def async_fetch_servers():
+    """
+    Asynchronous version of `fetch_servers`.
+
+    Returns:
+        list: List of IPs
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        data = await loop.getaddrinfo(
+            "all.api.radio-browser.info", 80, proto=socket.IPPROTO_TCP
+        )
+    except socket.gaierror:
+        log.exception("Network failure")
+        raise
+    return [ip[4][0] for ip in data if isinstance(ip[4], tuple)]
+
+
+async def async_fetch_hosts(
+    timeout=LOOKUP_TIMEOUT, deadline=DISCOVERY_DEADLINE
+):
+    """
+    Asynchronous version of `fetch_hosts`.
+
+    Each lookup is bounded by `timeout`, and lookups still pending when
+    `deadline` expires are cancelled and dropped.
+
+    Returns:
+        list: List of hostnames
+    """
+    servers = await async_fetch_servers()
+    if not servers:
+        return []
+
+    loop = asyncio.get_running_loop()
+
+    async def lookup(ip):
+        return await asyncio.wait_for(
+            loop.run_in_executor(None, rdns_lookup, ip), timeout
+        )
+
+    tasks = [asyncio.ensure_future(lookup(ip)) for ip in servers]
+    done, pending = await asyncio.wait(tasks, timeout=deadline)
+    for task in pending:
+        task.cancel()
+
+    names = []
+    for ip, task in zip(servers, tasks):
+        if task not in done:
+            log.warning("Reverse dns lookup for ip %s timed out", ip)
+            continue
         try:
-            host_name = rdns_lookup(ip)
+            names.append(task.result())
+        except asyncio.TimeoutError:
+            log.warning("Reverse dns lookup for ip %s timed out", ip)
         except RDNSLookupError as exc:
             log.exception(exc.error_msg)
-        else:
-            names.append(host_name)
     return names
 
 
-def pick_base_url():
-    hosts = fetch_hosts()
-    url = random.choice(sorted(hosts))
+def _read_cache_file(path):
+    """
+    Read the mirror list stored by `_write_cache_file`.
+
+    Returns:
+        tuple: (hosts, timestamp) or ([], 0.0) if there is no usable file.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return list(data["hosts"]), float(data["timestamp"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return [], 0.0
+
+
+def _write_cache_file(path, hosts, timestamp):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = "{}.{}.tmp".format(path, os.getpid())
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"hosts": hosts, "timestamp": timestamp}, f)
+        os.replace(tmp, path)
+    except OSError:
+        log.warning("Could not write mirror cache file %s", path)
+
+
+def cached_hosts(ttl=CACHE_TTL, cache_file=CACHE_FILE, refresh=False):
+    """
+    Get the `Radio Browser` mirrors, reusing previous discoveries.
+
+    The list is kept process-wide for `ttl` seconds and mirrored to
+    `cache_file`, so a cold start reuses the last-known mirrors without
+    touching DNS. A stale file is still used if discovery fails.
+
+    Args:
+        ttl (int, optional): Seconds a mirror list is considered fresh.
+        cache_file (str, optional): Path of the on-disk cache, `None`
+            disables it.
+        refresh (bool, optional): Ignore cached lists and rediscover.
+
+    Returns:
+        list: Sorted list of hostnames.
+    """
+    with _cache_lock:
+        hosts, stale = _lookup_cache(ttl, cache_file, refresh)
+        if hosts:
+            return hosts
+        try:
+            hosts = fetch_hosts()
+        except OSError:
+            if not stale:
+                raise
+            hosts = []
+        return _store_hosts(hosts, stale, ttl, cache_file)
+
+
+async def async_cached_hosts(
+    ttl=CACHE_TTL, cache_file=CACHE_FILE, refresh=False
+):
+    """
+    Asynchronous version of `cached_hosts`, sharing its caches.
+
+    Concurrent calls on a cold cache wait for a single discovery.
+
+    Returns:
+        list: Sorted list of hostnames.
+    """
+    with _cache_lock:
+        hosts, stale = _lookup_cache(ttl, cache_file, refresh)
+    if hosts:
+        return hosts
+    async with _discovery_lock():
+        # another task may have discovered the mirrors meanwhile
+        with _cache_lock:
+            hosts, stale = _lookup_cache(ttl, cache_file, refresh)
+        if hosts:
+            return hosts
+        try:
+            hosts = await async_fetch_hosts()
+        except OSError:
+            if not stale:
+                raise
+            hosts = []
+        with _cache_lock:
+            return _store_hosts(hosts, stale, ttl, cache_file)
+
+
+def _discovery_lock():
+    # asyncio locks belong to one event loop
+    loop = asyncio.get_running_loop()
+    lock = _async_locks.get(loop)
+    if lock is None:
+        lock = _async_locks[loop] = asyncio.Lock()
+    return lock
+
+
+def _lookup_cache(ttl, cache_file, refresh):
+    """
+    Returns:
+        tuple: (fresh hosts or [], stale hosts from `cache_file` or [])
+    """
+    now = time.time()
+    if not refresh and _cache["hosts"] and _cache["expires"] > now:
+        return list(_cache["hosts"]), []
+
+    stale = []
+    if cache_file:
+        stale, timestamp = _read_cache_file(cache_file)
+        if stale and not refresh and timestamp + ttl > now:
+            _cache.update(hosts=stale, expires=timestamp + ttl)
+            return list(stale), stale
+    return [], stale
+
+
+def _store_hosts(hosts, stale, ttl, cache_file):
+    now = time.time()
+    hosts = sorted(hosts)
+    if not hosts:
+        if not stale:
+            raise Error("No Radio Browser server could be found")
+        log.warning("Mirror discovery failed, using stale cache")
+        hosts = stale
+    elif cache_file:
+        _write_cache_file(cache_file, hosts, now)
+
+    _cache.update(hosts=hosts, expires=now + ttl)
+    return list(hosts)
+
+
+def clear_cache():
+    """Forget the process-wide list of mirrors."""
+    with _cache_lock:
+        _cache.update(hosts=[], expires=0.0)
+
+
+def pick_base_url(**kwargs):
+    hosts = cached_hosts(**kwargs)
+    url = random.choice(hosts)
+    return "https://{}/".format(url)
+
+
+async def async_pick_base_url(**kwargs):
+    hosts = await async_cached_hosts(**kwargs)
+    url = random.choice(hosts)
     return "https://{}/".format(url)
@@ -0,0 +1,292 @@
+"""
+This module caches decoded `Radio Browser` responses.
+"""
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlencode
+from urllib.parse import urlsplit
+
+
+log = logging.getLogger("pyradios")
+
+# seconds a response is fresh, by endpoint (without the format prefix)
+DEFAULT_TTLS = {
+    "countries": 24 * 60 * 60,
+    "countrycodes": 24 * 60 * 60,
+    "codecs": 24 * 60 * 60,
+    "languages": 24 * 60 * 60,
+    "states": 24 * 60 * 60,
+    "tags": 24 * 60 * 60,
+    "stations": 60 * 60,
+    "stations/byuuid": 10 * 60,
+    "stations/topvote": 10 * 60,
+    "stations/search": 5 * 60,
+    "stations/changed": 0,
+    # clicks must always reach the server
+    "url": 0,
+}
+
+
+class CacheEntry:
+    __slots__ = ("data", "expires", "etag", "last_modified", "size")
+
+    def __init__(
+        self, data, expires, etag=None, last_modified=None, size=0
+    ):
+        self.data = data
+        self.expires = expires
+        self.etag = etag
+        self.last_modified = last_modified
+        # bytes of the response body, an estimate of the memory used
+        self.size = size
+
+    def fresh(self, now=None):
+        return self.expires > (time.time() if now is None else now)
+
+    def validators(self):
+        """Headers to revalidate a stale entry with the server."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class MemoryCache:
+    """In-memory backend, evicts the least recently used entries.
+
+    Entries are returned as stored, callers must not modify them.
+
+    Args:
+        maxsize (int, optional): Maximum number of entries.
+        maxbytes (int, optional): Maximum total size of the responses.
+            Larger responses, e.g. the full station list, are not kept.
+    """
+
+    def __init__(self, maxsize=1024, maxbytes=32 * 1024 * 1024):
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self._data = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                self._data.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        with self._lock:
+            self._pop(key)
+            if entry.size > self.maxbytes:
+                return
+            self._data[key] = entry
+            self._bytes += entry.size
+            while (
+                len(self._data) > self.maxsize or self._bytes > self.maxbytes
+            ):
+                self._bytes -= self._data.popitem(last=False)[1].size
+
+    def _pop(self, key):
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def delete(self, key):
+        with self._lock:
+            self._pop(key)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+
+class SQLiteCache:
+    """SQLite backend, evicts the least recently used entries.
+
+    The cache survives restarts and can be shared between processes.
+
+    Args:
+        path (str, optional): Database file.
+        maxsize (int, optional): Maximum number of entries.
+    """
+
+    def __init__(self, path="pyradios_cache.sqlite", maxsize=4096):
+        self.path = path
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY,"
+                " data TEXT NOT NULL,"
+                " expires REAL NOT NULL,"
+                " etag TEXT,"
+                " last_modified TEXT,"
+                " accessed REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed"
+                " ON responses (accessed)"
+            )
+
+    def __len__(self):
+        with self._lock:
+            row = self._conn.execute("SELECT COUNT(*) FROM responses")
+            return row.fetchone()[0]
+
+    def get(self, key):
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT data, expires, etag, last_modified"
+                " FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE responses SET accessed = ? WHERE key = ?",
+                (time.time(), key),
+            )
+        return CacheEntry(json.loads(row[0]), *row[1:])
+
+    def set(self, key, entry):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    json.dumps(entry.data),
+                    entry.expires,
+                    entry.etag,
+                    entry.last_modified,
+                    time.time(),
+                ),
+            )
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                " SELECT key FROM responses ORDER BY accessed DESC"
+                " LIMIT -1 OFFSET ?)",
+                (self.maxsize,),
+            )
+
+    def delete(self, key):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+
+    def close(self):
+        self._conn.close()
+
+
+class ResponseCache:
+    """Cache of decoded responses with a time to live per endpoint.
+
+    Expired entries are kept with the `ETag` and `Last-Modified` headers
+    of their response, the client revalidates them with a conditional
+    request and a `304 Not Modified` reply renews the entry without
+    transferring or decoding the body again.
+
+    Args:
+        backend (obj, optional): `MemoryCache` (default) or `SQLiteCache`.
+        ttls (dict, optional): Overrides of `DEFAULT_TTLS`, e.g.
+            `{"stations/search": 60}`. Zero disables caching.
+        default_ttl (int, optional): TTL of endpoints not in `ttls`.
+
+    Examples:
+
+        >>> from pyradios import RadioBrowser
+        >>> from pyradios.cache import ResponseCache, SQLiteCache
+        >>> cache = ResponseCache(SQLiteCache("radios.sqlite"))
+        >>> rb = RadioBrowser(cache=cache)
+        >>> rb.countries()
+        >>> cache.stats
+        {'hits': 0, 'misses': 1, 'revalidated': 0}
+    """
+
+    def __init__(self, backend=None, ttls=None, default_ttl=0):
+        self.backend = backend if backend is not None else MemoryCache()
+        self.ttls = dict(DEFAULT_TTLS)
+        self.ttls.update(ttls or {})
+        self.default_ttl = default_ttl
+        self.stats = {"hits": 0, "misses": 0, "revalidated": 0}
+        self._lock = threading.Lock()
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    @staticmethod
+    def key(url, params):
+        """Cache key of a request, independent of the order of params."""
+        if not params:
+            return url
+        items = sorted((k, str(v)) for k, v in params.items())
+        return "{}?{}".format(url, urlencode(items))
+
+    def ttl(self, url):
+        """Time to live of responses of the endpoint of `url`."""
+        # drop the leading format, e.g. `json/stations/search`
+        parts = urlsplit(url).path.strip("/").split("/")[1:]
+        while parts:
+            ttl = self.ttls.get("/".join(parts))
+            if ttl is not None:
+                return ttl
+            parts.pop()
+        return self.default_ttl
+
+    def get(self, key):
+        """
+        Returns:
+            CacheEntry: The entry, possibly expired, or None.
+        """
+        entry = self.backend.get(key)
+        self._count("hits" if entry and entry.fresh() else "misses")
+        return entry
+
+    def set(self, key, url, data, headers=None, size=0):
+        ttl = self.ttl(url)
+        if ttl <= 0:
+            return
+        headers = headers or {}
+        self.backend.set(
+            key,
+            CacheEntry(
+                data,
+                time.time() + ttl,
+                headers.get("ETag"),
+                headers.get("Last-Modified"),
+                size,
+            ),
+        )
+
+    def revalidated(self, key, url, entry, headers=None):
+        """Renew `entry` after the server answered `304 Not Modified`."""
+        self._count("revalidated")
+        headers = headers or {}
+        entry.expires = time.time() + self.ttl(url)
+        entry.etag = headers.get("ETag", entry.etag)
+        entry.last_modified = headers.get(
+            "Last-Modified", entry.last_modified
+        )
+        self.backend.set(key, entry)
+        return entry.data
+
+    def clear(self):
+        self.backend.clear()
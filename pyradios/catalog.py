@@ -0,0 +1,386 @@
+"""
+This module stores a local copy of the station catalog.
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+
+from pyradios.utils import validators
+
+
+log = logging.getLogger("pyradios")
+
+
+class JSONCatalog:
+    """Station catalog kept in memory and saved to a JSON file.
+
+    Stations are stored as dicts by `stationuuid`, together with the
+    sync state (the `changeuuid` of the last applied change).
+
+    Args:
+        path (str, optional): File the catalog is loaded from and saved
+            to. Without a path the catalog only lives in memory.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.stations = {}
+        self.state = {}
+        if path and os.path.exists(path):
+            self.load()
+
+    def __len__(self):
+        return len(self.stations)
+
+    def __iter__(self):
+        return iter(self.stations.values())
+
+    def __contains__(self, uuid):
+        return uuid in self.stations
+
+    def get(self, uuid):
+        return self.stations.get(uuid)
+
+    def uuids(self):
+        return set(self.stations)
+
+    def upsert(self, stations):
+        """Insert or update stations, merging into the stored fields.
+
+        Returns:
+            tuple: Number of inserted and of updated stations.
+        """
+        inserted = updated = 0
+        for station in stations:
+            station = dict(station)
+            current = self.stations.get(station["stationuuid"])
+            if current is None:
+                self.stations[station["stationuuid"]] = station
+                inserted += 1
+            else:
+                current.update(station)
+                updated += 1
+        return inserted, updated
+
+    def delete(self, uuids):
+        """
+        Returns:
+            int: Number of deleted stations.
+        """
+        return sum(self.stations.pop(u, None) is not None for u in uuids)
+
+    def load(self):
+        with open(self.path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        self.state = data.get("state", {})
+        self.stations = {s["stationuuid"]: s for s in data["stations"]}
+
+    def save(self):
+        if not self.path:
+            return
+        data = {"state": self.state, "stations": list(self)}
+        tmp = "{}.{}.tmp".format(self.path, os.getpid())
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, self.path)
+
+
+# columns of the stations table besides the json document, by type
+_TEXT_COLUMNS = (
+    "name",
+    "url",
+    "homepage",
+    "favicon",
+    "tags",
+    "country",
+    "countrycode",
+    "state",
+    "language",
+    "codec",
+    "lastchecktime",
+    "clicktimestamp",
+)
+_INTEGER_COLUMNS = (
+    "votes",
+    "bitrate",
+    "lastcheckok",
+    "clickcount",
+    "clicktrend",
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS stations (
+    stationuuid TEXT PRIMARY KEY,
+    {columns},
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS stations_name ON stations (name);
+CREATE INDEX IF NOT EXISTS stations_countrycode ON stations (countrycode);
+CREATE INDEX IF NOT EXISTS stations_codec ON stations (codec);
+CREATE TABLE IF NOT EXISTS station_tags (
+    stationuuid TEXT NOT NULL,
+    tag TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS station_tags_tag ON station_tags (tag);
+CREATE INDEX IF NOT EXISTS station_tags_uuid ON station_tags (stationuuid);
+CREATE TABLE IF NOT EXISTS station_languages (
+    stationuuid TEXT NOT NULL,
+    language TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS station_languages_language
+    ON station_languages (language);
+CREATE INDEX IF NOT EXISTS station_languages_uuid
+    ON station_languages (stationuuid);
+CREATE TABLE IF NOT EXISTS state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+""".format(
+    columns=",\n    ".join(
+        ["{} TEXT COLLATE NOCASE".format(c) for c in _TEXT_COLUMNS]
+        + ["{} INTEGER".format(c) for c in _INTEGER_COLUMNS]
+    )
+)
+
+
+def _split(value):
+    return sorted({v for v in (value or "").lower().split(",") if v})
+
+
+def _flag(value):
+    return str(value).lower() == "true"
+
+
+class _State(dict):
+    """Sync state, written through to the `state` table."""
+
+    def __init__(self, conn, lock):
+        self._conn = conn
+        self._lock = lock
+        with lock:
+            rows = conn.execute("SELECT key, value FROM state").fetchall()
+        super().__init__((k, json.loads(v)) for k, v in rows)
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO state VALUES (?, ?)",
+                (key, json.dumps(value)),
+            )
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+
+class SQLiteCatalog:
+    """Station catalog stored in SQLite, shared by processes.
+
+    It has the interface of `JSONCatalog`, so `sync.CatalogSync` can
+    keep it up to date, and a `search` method taking the arguments of
+    `RadioBrowser.search`, so it can back a `RadioFacets`. Country code,
+    codec, name, tags and languages are indexed. The database runs in
+    WAL mode: many worker processes can query one page-cached file while
+    a single process syncs it.
+
+    Args:
+        path (str, optional): Database file.
+
+    Examples:
+
+        >>> from pyradios import RadioBrowser, RadioFacets
+        >>> from pyradios.catalog import SQLiteCatalog
+        >>> from pyradios.sync import CatalogSync
+        >>> catalog = SQLiteCatalog('stations.sqlite')
+        >>> CatalogSync(RadioBrowser(), catalog).sync()
+        >>> catalog.search(tag='jazz', countrycode='BE', limit=10)
+        >>> RadioFacets(catalog, countrycode='BE').tags[:5]
+    """
+
+    ORDERS = frozenset(_TEXT_COLUMNS + _INTEGER_COLUMNS)
+
+    def __init__(self, path="stations.sqlite"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self.state = _State(self._conn, self._lock)
+
+    def _query(self, sql, args=()):
+        with self._lock:
+            return self._conn.execute(sql, args).fetchall()
+
+    def __len__(self):
+        return self._query("SELECT COUNT(*) FROM stations")[0][0]
+
+    def __iter__(self):
+        rows = self._query("SELECT data FROM stations")
+        return (json.loads(data) for data, in rows)
+
+    def __contains__(self, uuid):
+        return self.get(uuid) is not None
+
+    def get(self, uuid):
+        with self._lock:
+            return self._get(uuid)
+
+    def _get(self, uuid):
+        row = self._conn.execute(
+            "SELECT data FROM stations WHERE stationuuid = ?", (uuid,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def uuids(self):
+        rows = self._query("SELECT stationuuid FROM stations")
+        return {uuid for uuid, in rows}
+
+    def upsert(self, stations):
+        """Insert or update stations, merging into the stored fields.
+
+        Returns:
+            tuple: Number of inserted and of updated stations.
+        """
+        inserted = updated = 0
+        columns = _TEXT_COLUMNS + _INTEGER_COLUMNS
+        insert = "INSERT OR REPLACE INTO stations VALUES ({})".format(
+            ", ".join("?" * (len(columns) + 2))
+        )
+        with self._lock, self._conn:
+            for station in stations:
+                station = dict(station)
+                uuid = station["stationuuid"]
+                current = self._get(uuid)
+                if current is None:
+                    inserted += 1
+                else:
+                    current.update(station)
+                    station = current
+                    updated += 1
+                self._conn.execute(
+                    insert,
+                    [uuid]
+                    + [station.get(c) for c in columns]
+                    + [json.dumps(station)],
+                )
+                self._delete_postings([uuid])
+                self._conn.executemany(
+                    "INSERT INTO station_tags VALUES (?, ?)",
+                    [(uuid, t) for t in _split(station.get("tags"))],
+                )
+                self._conn.executemany(
+                    "INSERT INTO station_languages VALUES (?, ?)",
+                    [(uuid, v) for v in _split(station.get("language"))],
+                )
+        return inserted, updated
+
+    def _delete_postings(self, uuids):
+        for table in ("station_tags", "station_languages"):
+            self._conn.executemany(
+                "DELETE FROM {} WHERE stationuuid = ?".format(table),
+                [(u,) for u in uuids],
+            )
+
+    def delete(self, uuids):
+        """
+        Returns:
+            int: Number of deleted stations.
+        """
+        uuids = list(uuids)
+        with self._lock, self._conn:
+            deleted = self._conn.executemany(
+                "DELETE FROM stations WHERE stationuuid = ?",
+                [(u,) for u in uuids],
+            ).rowcount
+            self._delete_postings(uuids)
+        return deleted
+
+    def save(self):
+        with self._lock:
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def search(self, **kwargs):
+        """Advanced search, see `RadioBrowser.search` for the arguments.
+
+        Returns:
+            list: Stations.
+        """
+        validators["search"](kwargs)
+        where, args = [], []
+        for filters in (_text_filters, _posting_filters, _numeric_filters):
+            for clause, values in filters(kwargs):
+                where.append(clause)
+                args.extend(values)
+
+        sql = "SELECT data FROM stations"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY {} LIMIT ? OFFSET ?".format(self._order_by(kwargs))
+        args.append(int(kwargs.get("limit", 100000)))
+        args.append(int(kwargs.get("offset", 0)))
+        return [json.loads(data) for data, in self._query(sql, args)]
+
+    def _order_by(self, kwargs):
+        order = kwargs.get("order", "name")
+        if order == "random":
+            return "random()"
+        if order not in self.ORDERS:
+            raise ValueError("Unknown order {!r}".format(order))
+        direction = "DESC" if _flag(kwargs.get("reverse", False)) else ""
+        return "{} {}, stationuuid".format(order, direction)
+
+
+# the filters below yield (clause, arguments) pairs of the WHERE clause
+
+
+def _text_filters(kwargs):
+    for field in ("name", "country", "state", "codec"):
+        value = kwargs.get(field)
+        if not value:
+            continue
+        if _flag(kwargs.get(field + "_exact", False)):
+            yield "{} = ?".format(field), [value]
+        else:
+            yield "instr(lower({}), ?) > 0".format(field), [value.lower()]
+    if kwargs.get("countrycode"):
+        yield "countrycode = ?", [kwargs["countrycode"]]
+
+
+def _posting_filters(kwargs):
+    postings = [
+        ("language", "station_languages", "language"),
+        ("tag", "station_tags", "tag"),
+    ]
+    for field, table, column in postings:
+        value = kwargs.get(field)
+        if not value:
+            continue
+        if _flag(kwargs.get(field + "_exact", False)):
+            match = "{} = ?".format(column)
+        else:
+            match = "instr({}, ?) > 0".format(column)
+        clause = "stationuuid IN (SELECT stationuuid FROM {} WHERE {})"
+        yield clause.format(table, match), [value.lower()]
+    for tag in _split(kwargs.get("tag_list")):
+        yield (
+            "stationuuid IN"
+            " (SELECT stationuuid FROM station_tags WHERE tag = ?)",
+            [tag],
+        )
+
+
+def _numeric_filters(kwargs):
+    if "bitrate_min" in kwargs:
+        yield "bitrate >= ?", [int(kwargs["bitrate_min"])]
+    if "bitrate_max" in kwargs:
+        yield "bitrate <= ?", [int(kwargs["bitrate_max"])]
+    if _flag(kwargs.get("hidebroken", False)):
+        yield "lastcheckok = 1", []
@@ -0,0 +1,58 @@
+"""
+This module decodes the JSON responses.
+
+The fastest installed backend is used: `msgspec`, then `orjson`, then
+the standard library. Run `pip install pyradios[fast]` to install one.
+"""
+import json
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+BACKENDS = ("msgspec", "orjson", "json")
+
+
+def json_decoder(backend=None):
+    """Return a function decoding a JSON document from bytes.
+
+    Args:
+        backend (str, optional): One of `BACKENDS`. Defaults to the
+            first one installed.
+
+    Raises:
+        ImportError: If `backend` is not installed.
+        ValueError: If `backend` is unknown.
+
+    Returns:
+        callable: Taking bytes, returning the decoded document.
+
+    Examples:
+
+        >>> from pyradios import RadioBrowser
+        >>> from pyradios.decoders import json_decoder
+        >>> rb = RadioBrowser(decoder=json_decoder('orjson'))
+    """
+    if backend is None:
+        backend = next(b for b in BACKENDS if _installed(b))
+    if backend not in BACKENDS:
+        raise ValueError("Unknown JSON backend {!r}".format(backend))
+    if not _installed(backend):
+        raise ImportError("JSON backend {!r} is not installed".format(backend))
+    if backend == "msgspec":
+        return msgspec.json.Decoder().decode
+    if backend == "orjson":
+        return orjson.loads
+    return json.loads
+
+
+def _installed(backend):
+    modules = {"msgspec": msgspec, "orjson": orjson, "json": json}
+    return modules.get(backend) is not None
@@ -1,66 +1,277 @@
 from pyradios.radios import RadioBrowser
+from pyradios.index import LocalStationIndex
 from itertools import chain
-from functools import reduce
-from collections import defaultdict
+from collections import Counter
+from collections.abc import Mapping
+from operator import itemgetter
+from bisect import bisect_right
 import logging
 
 
 log = logging.getLogger("pyradios")
 
 
+def facet_histogram(stations, facet, top=None):
+    """Count the values of `facet` over `stations`.
+
+    Comma separated values are counted separately, empty values as ''.
+    The raw values are counted first, in C, so each distinct value is
+    split only once however many stations share it.
+
+    Args:
+        stations (list): Stations, as dicts or `records.Station`.
+        facet (str): Name of the field to count.
+        top (int, optional): Only keep the `top` most frequent values,
+            selected with a heap instead of sorting all of them.
+
+    Returns:
+        list: (value, count) tuples, from high to low count.
+    """
+    counts = Counter()
+    for value, n in Counter(map(itemgetter(facet), stations)).items():
+        for part in value.split(","):
+            counts[part] += n
+    return counts.most_common(top)
+
+
+def bucket_histogram(stations, facet, edges):
+    """Count the numeric values of `facet` per bucket.
+
+    Args:
+        stations (list): Stations, as dicts or `records.Station`.
+        facet (str): Name of the numeric field to count, e.g. `bitrate`.
+        edges (list): Ascending lower bounds of the buckets. Values below
+            the first bound are counted in the first bucket.
+
+    Returns:
+        list: (bucket, count) tuples, in bucket order, without the empty
+            buckets. Buckets are named '64-127' or '320+' for the last.
+    """
+    names = [
+        "{}-{}".format(lo, hi - 1) for lo, hi in zip(edges, edges[1:])
+    ] + ["{}+".format(edges[-1])]
+    counts = [0] * len(edges)
+    for value, n in Counter(map(itemgetter(facet), stations)).items():
+        counts[max(bisect_right(edges, value or 0) - 1, 0)] += n
+    return [(name, n) for name, n in zip(names, counts) if n]
+
+
+class _FacetMap(Mapping):
+    """Facets of a `RadioFacets` by name, computed on lookup."""
+
+    def __init__(self, rf):
+        self._rf = rf
+
+    def __getitem__(self, key):
+        return self._rf._facet(key)
+
+    def __iter__(self):
+        return (self._rf._public(f) for f in self._rf.fields)
+
+    def __len__(self):
+        return len(self._rf.fields)
+
+
 class RadioFacets:
+    """Faceted search over the stations matching a filter.
+
+    Every facet is computed on first access, e.g. `rf.tags`, and kept.
+    The fields faceted are `FACETS` unless a `facets` list is given;
+    fields in `BUCKETS` are numeric and counted per range of values.
+
+    The stations are only fetched when needed. Without a filter, and a
+    `RadioBrowser` service, the facets having an aggregate endpoint are
+    read from it (`json/tags`, `json/countrycodes`, ...) instead of being
+    counted over the downloaded stations. These counts are made by the
+    service: tags are lowercased and stations without a value are not
+    counted.
+
+    `narrow()` is evaluated locally on the stations already fetched when
+    it refines a complete result set (no `limit` or `offset`), and every
+    facet derived from the same root is kept, so `broaden()` back to a
+    known filter does not query the service again either.
+    """
+
     FACETS = ["tags", "countrycode", "language", "state", "codec"]
 
-    def __init__(self, rb, **params):
+    # lower bounds of the buckets of the numeric facets
+    BUCKETS = {
+        "bitrate": (0, 64, 96, 128, 192, 256, 320),
+        "votes": (0, 1, 10, 100, 1000, 10000),
+        "clickcount": (0, 1, 10, 100, 1000, 10000),
+    }
+
+    # number of values kept per facet, None keeps all of them
+    TOP = None
+
+    # parameters shaping the result list rather than filtering stations
+    PAGING = ("limit", "offset")
+
+    # facets counted by the service, by field: the RadioBrowser method
+    AGGREGATES = {
+        "tags": "tags",
+        "countrycode": "countrycodes",
+        "language": "languages",
+        "state": "states",
+        "codec": "codecs",
+    }
+
+    # filters leaving the set of stations, hence the aggregates, unchanged
+    UNFILTERED = ("order", "reverse")
+
+    def __init__(self, rb, facets=None, **params):
         assert rb is not None, "facets requires a RadioBrowser service to call"
-        assert isinstance(rb, RadioBrowser), "RadioBrowser service wrong type"
+        # anything answering RadioBrowser.search, e.g. a local catalog
+        assert isinstance(rb, RadioBrowser) or callable(
+            getattr(rb, "search", None)
+        ), "RadioBrowser service wrong type"
         self.rb = rb
         self.filter = params if params is not None else dict()
-        self._fetch_and_calc()
+        self.fields = list(self.FACETS if facets is None else facets)
+        self._family = {}
+        self._index = None
+        self._result = None
+        self._calc()
+        self._family[self._key(self.filter)] = self
+
+    @classmethod
+    def _from_result(cls, parent, filter, result):
+        rf = cls.__new__(cls)
+        rf.rb = parent.rb
+        rf.filter = filter
+        rf.fields = parent.fields
+        rf._family = parent._family
+        rf._index = None
+        rf._result = result
+        rf._calc()
+        rf._family[cls._key(filter)] = rf
+        return rf
+
+    @staticmethod
+    def _key(filter):
+        return tuple(sorted((k, str(v)) for k, v in filter.items()))
 
     def __repr__(self):
         typename = type(self).__name__
         args = ['{}={!r}'.format(k, v) for k, v in self.filter.items()]
         return "%s(%s)" % (typename, ', '.join(args))
 
-    def _fetch_and_calc(self):
-        self.result = self.rb.search(**self.filter)
-        self.facets = dict()
-
-        def facetcount(facets, item):
-            for f in facets.keys():
-                for fv in item[f].split(','):
-                    facets[f][fv] += 1  # tracks empty facet-values as ''
-            return facets
-
-        init = {f: defaultdict(int) for f in RadioFacets.FACETS}
-        captured_hist_per_facet = reduce(facetcount, self.result, init)
-        for f in captured_hist_per_facet.keys():
-            # unsorted facet histogram
-            usf_hist = captured_hist_per_facet[f].items()
-            # order histogram items from high to low
-            sf_hist = sorted(usf_hist, key=lambda i: i[1], reverse=True)
-            # pluralize the key if needed
-            fpub = f if f[-1] == 's' else f + "s"
-            self.facets[fpub] = [{"name": k, "count": v} for k, v in sf_hist]
+    @property
+    def result(self):
+        """Stations matching the filter, fetched on first access."""
+        if self._result is None:
+            params = dict(self.filter)
+            if isinstance(self.rb, RadioBrowser):
+                # whatever the format of the client, facets parse json
+                params["fmt"] = "json"
+            self._result = self.rb.search(**params)
+        return self._result
+
+    @result.setter
+    def result(self, stations):
+        self._result = stations
+
+    def _calc(self):
+        # facets are computed on first access, see _facet
+        self._facets = dict()
+
+    @property
+    def facets(self):
+        """Mapping of every facet, e.g. `rf.facets['tags']`."""
+        return _FacetMap(self)
+
+    def _facet(self, key):
+        if key not in self._facets:
+            for field in self.fields:
+                if self._public(field) == key:
+                    self._facets[key] = self._histogram(field)
+                    break
+            else:
+                raise KeyError(key)
+        return self._facets[key]
+
+    @staticmethod
+    def _public(field):
+        # pluralize the key if needed
+        return field if field[-1] == 's' else field + "s"
+
+    def _server_side(self, field):
+        """True if the service can count `field` for the filter."""
+        return (
+            field in self.AGGREGATES
+            and isinstance(self.rb, RadioBrowser)
+            and all(k in self.UNFILTERED for k in self.filter)
+        )
+
+    def _aggregate(self, field):
+        items = getattr(self.rb, self.AGGREGATES[field])(fmt="json")
+        counts = Counter()
+        for item in items:
+            # states are listed per country, merge them by name
+            counts[item["name"]] += item["stationcount"]
+        return counts.most_common(self.TOP)
+
+    def _histogram(self, field):
+        if self._server_side(field):
+            log.debug("counting %s on the service" % field)
+            hist = self._aggregate(field)
+        elif field in self.BUCKETS:
+            hist = bucket_histogram(self.result, field, self.BUCKETS[field])
+        else:
+            # ordered from high to low, tracks empty facet-values as ''
+            hist = facet_histogram(self.result, field, self.TOP)
+        return [{"name": k, "count": v} for k, v in hist]
 
     def __getattr__(self, key):
-        if key in self.facets:
-            return self.facets[key]
-        # else
-        return getattr(self, key)
+        if "_facets" in self.__dict__:
+            try:
+                return self._facet(key)
+            except KeyError:
+                pass
+        typename = type(self).__name__
+        raise AttributeError(
+            "{!r} object has no attribute {!r}".format(typename, key)
+        )
 
     def __len__(self):
         return len(self.result)
 
     def _derived(self, **filter):
-        return RadioFacets(self.rb, **filter)
+        known = self._family.get(self._key(filter))
+        if known is not None:
+            log.debug("reusing facets for %s" % filter)
+            return known
+        rf = type(self)(self.rb, facets=self.fields, **filter)
+        rf._family = self._family
+        self._family[self._key(filter)] = rf
+        return rf
+
+    def _refines(self, pars2add):
+        """True if `pars2add` only narrows down the complete result."""
+        if any(k in self.filter for k in self.PAGING):
+            return False
+        return all(
+            k not in self.filter or str(self.filter[k]) == str(v)
+            for k, v in pars2add.items()
+        )
 
     def narrow(self, **pars2add):
         log.debug("flatten ++ params(%s)" % pars2add)
         filter = dict(self.filter)  # clone the dict
         filter.update(pars2add)
-        return self._derived(**filter)
+        known = self._family.get(self._key(filter))
+        if known is not None or not self._refines(pars2add):
+            return self._derived(**filter)
+        if self._result is None:
+            # nothing fetched yet, let the service filter the stations
+            return self._derived(**filter)
+
+        if self._index is None:
+            self._index = LocalStationIndex(self.result)
+        # the whole filter, so modifiers like `name_exact` meet their
+        # field; the parent has no paging keys, any given are new ones
+        result = self._index.search(**filter)
+        return self._from_result(self, filter, result)
 
     def broaden(self, *keys2rm, **pars2rm):
         log.debug("broaden -- keys(%s) and params(%s)" % (keys2rm, pars2rm))
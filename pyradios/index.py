@@ -0,0 +1,179 @@
+"""
+This module searches a snapshot of the station catalog offline.
+"""
+import random
+from itertools import islice
+
+from pyradios.utils import validators
+
+
+# filters matched against a single valued field
+SCALAR_FIELDS = ("country", "countrycode", "state", "codec")
+
+# filters matched against each value of a comma separated field
+LIST_FIELDS = {"language": "language", "tag": "tags"}
+
+NUMERIC_ORDERS = frozenset(
+    ["votes", "bitrate", "lastcheckok", "clickcount", "clicktrend"]
+)
+
+
+def _split(value):
+    return [v for v in (value or "").lower().split(",") if v]
+
+
+def _sort_key(order):
+    if order in NUMERIC_ORDERS:
+        return lambda station: station.get(order) or 0
+    return lambda station: (station.get(order) or "").lower()
+
+
+def _flag(value):
+    return str(value).lower() == "true"
+
+
+class LocalStationIndex:
+    """Answer `RadioBrowser.search` queries from a local snapshot.
+
+    The snapshot is indexed once: every country, country code, state,
+    codec, language and tag maps to the stations having it. Exact
+    filters are dict lookups, substring filters only scan the distinct
+    values, and the result is sorted through precomputed rankings.
+
+    Args:
+        stations (list): Stations, as dicts or `records.Station`.
+
+    Examples:
+
+        >>> from pyradios import RadioBrowser
+        >>> from pyradios.index import LocalStationIndex
+        >>> index = LocalStationIndex.from_browser(RadioBrowser())
+        >>> index.search(tag='jazz', countrycode='BE', order='votes',
+        ...              reverse=True, limit=10)
+    """
+
+    def __init__(self, stations):
+        self.stations = list(stations)
+        self._names = [(s.get("name") or "").lower() for s in self.stations]
+        self._postings = {f: {} for f in SCALAR_FIELDS}
+        self._postings.update({f: {} for f in LIST_FIELDS})
+        for pos, station in enumerate(self.stations):
+            for field in SCALAR_FIELDS:
+                value = (station.get(field) or "").lower()
+                self._postings[field].setdefault(value, []).append(pos)
+            for field, key in LIST_FIELDS.items():
+                for value in set(_split(station.get(key))):
+                    self._postings[field].setdefault(value, []).append(pos)
+        self._rankings = {}
+
+    @classmethod
+    def from_browser(cls, rb, **kwargs):
+        """Snapshot the catalog of `rb`, see `RadioBrowser.iter_stations`."""
+        return cls(rb.iter_stations(**kwargs))
+
+    def __len__(self):
+        return len(self.stations)
+
+    def _ranking(self, order):
+        """Positions of all stations sorted by `order`, and their ranks."""
+        if order not in self._rankings:
+            key = _sort_key(order)
+            ordered = sorted(
+                range(len(self.stations)),
+                key=lambda pos: key(self.stations[pos]),
+            )
+            ranks = [0] * len(ordered)
+            for rank, pos in enumerate(ordered):
+                ranks[pos] = rank
+            self._rankings[order] = (ordered, ranks)
+        return self._rankings[order]
+
+    def _match(self, field, value, exact):
+        value = value.lower()
+        postings = self._postings[field]
+        if exact:
+            return set(postings.get(value, ()))
+        matches = set()
+        for key, positions in postings.items():
+            if value in key:
+                matches.update(positions)
+        return matches
+
+    def _candidates(self, params):
+        """
+        Returns:
+            set: Positions of matching stations or None for all stations.
+        """
+        sets = []
+        name = params.get("name")
+        if name:
+            name = name.lower()
+            names = enumerate(self._names)
+            if _flag(params.get("name_exact", False)):
+                sets.append({pos for pos, n in names if n == name})
+            else:
+                sets.append({pos for pos, n in names if name in n})
+        for field in SCALAR_FIELDS + tuple(LIST_FIELDS):
+            value = params.get(field)
+            if value:
+                exact = field == "countrycode" or _flag(
+                    params.get(field + "_exact", False)
+                )
+                sets.append(self._match(field, value, exact))
+        for tag in _split(params.get("tag_list")):
+            sets.append(self._match("tag", tag, exact=True))
+        if not sets:
+            return None
+        sets.sort(key=len)
+        return sets[0].intersection(*sets[1:])
+
+    def _accept(self, params):
+        """Predicate of the filters not served by an index."""
+        bitrate_min = int(params.get("bitrate_min", 0))
+        bitrate_max = int(params.get("bitrate_max", 1000000))
+        hidebroken = _flag(params.get("hidebroken", False))
+        if bitrate_min <= 0 and bitrate_max >= 1000000 and not hidebroken:
+            return None
+
+        def accept(station):
+            bitrate = station.get("bitrate") or 0
+            if not bitrate_min <= bitrate <= bitrate_max:
+                return False
+            return not hidebroken or station.get("lastcheckok") == 1
+
+        return accept
+
+    def search(self, **kwargs):
+        """Advanced search, see `RadioBrowser.search` for the arguments.
+
+        Returns:
+            list: Stations.
+        """
+        validators["search"](kwargs)
+        candidates = self._candidates(kwargs)
+        accept = self._accept(kwargs)
+        order = kwargs.get("order", "name")
+        reverse = _flag(kwargs.get("reverse", False))
+        offset = int(kwargs.get("offset", 0))
+        limit = int(kwargs.get("limit", 100000))
+
+        if order == "random":
+            positions = list(
+                range(len(self.stations)) if candidates is None else candidates
+            )
+            random.shuffle(positions)
+        else:
+            ordered, ranks = self._ranking(order)
+            if candidates is None:
+                positions = ordered
+            elif len(candidates) * 8 < len(ordered):
+                positions = sorted(candidates, key=ranks.__getitem__)
+            else:
+                positions = [p for p in ordered if p in candidates]
+            if reverse:
+                positions = reversed(positions)
+
+        stations = (self.stations[p] for p in positions)
+        if accept is not None:
+            stations = filter(accept, stations)
+        return list(islice(stations, offset, offset + limit))
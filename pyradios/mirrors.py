@@ -0,0 +1,188 @@
+"""
+This module ranks `Radio Browser` servers by latency and health.
+"""
+import logging
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+from pyradios.base_url import cached_hosts
+
+
+log = logging.getLogger("pyradios")
+
+
+class MirrorStats:
+    """Exponentially weighted latency and error rate of one server."""
+
+    __slots__ = ("host", "latency", "error_rate", "samples", "checked")
+
+    def __init__(self, host):
+        self.host = host
+        self.latency = math.inf
+        self.error_rate = 0.0
+        self.samples = 0
+        self.checked = 0.0
+
+    def __repr__(self):
+        return "{}(host={!r}, latency={:.3f}, error_rate={:.2f})".format(
+            type(self).__name__, self.host, self.latency, self.error_rate
+        )
+
+    def update(self, latency, ok, alpha):
+        if ok:
+            if self.latency == math.inf:
+                self.latency = latency
+            else:
+                self.latency += alpha * (latency - self.latency)
+        self.error_rate += alpha * ((0.0 if ok else 1.0) - self.error_rate)
+        self.samples += 1
+        self.checked = time.monotonic()
+
+
+class MirrorSelector:
+    """Route requests to the fastest healthy `Radio Browser` server.
+
+    Every candidate is probed with a cheap request; the latency and
+    outcome of each probe (and of every request reported through
+    `record`) feed an exponentially weighted score per server.
+
+    Args:
+        hosts (list, optional): Candidate hostnames. Defaults to the
+            discovered mirrors, see `base_url.cached_hosts`, read again
+            on every re-ranking.
+        alpha (float, optional): Weight of the newest sample.
+        max_error_rate (float, optional): Servers failing more often
+            are only used when no healthy server is left.
+        interval (int, optional): Seconds between background re-rankings.
+        probe_path (str, optional): Endpoint used to probe a server.
+        probe_timeout (float, optional): Seconds to wait for a probe.
+
+    Examples:
+
+        >>> from pyradios import RadioBrowser
+        >>> from pyradios.mirrors import MirrorSelector
+        >>> selector = MirrorSelector()
+        >>> selector.start()
+        >>> rb = RadioBrowser(mirror_selector=selector)
+    """
+
+    def __init__(
+        self,
+        hosts=None,
+        alpha=0.3,
+        max_error_rate=0.5,
+        interval=300,
+        probe_path="json/stats",
+        probe_timeout=2.0,
+    ):
+        self._explicit_hosts = list(hosts) if hosts else None
+        self._hosts = self._explicit_hosts
+        self.alpha = alpha
+        self.max_error_rate = max_error_rate
+        self.interval = interval
+        self.probe_path = probe_path
+        self.probe_timeout = probe_timeout
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def discovers(self):
+        """True if the candidates come from server discovery."""
+        return self._explicit_hosts is None
+
+    @property
+    def hosts(self):
+        if self._hosts is None:
+            self._hosts = cached_hosts()
+        return self._hosts
+
+    def stats(self, host):
+        with self._lock:
+            if host not in self._stats:
+                self._stats[host] = MirrorStats(host)
+            return self._stats[host]
+
+    def record(self, host, latency, ok=True):
+        """Feed the outcome of a request to `host` into its score."""
+        stats = self.stats(host)
+        with self._lock:
+            stats.update(latency, ok, self.alpha)
+
+    def probe(self, host):
+        url = "https://{}/{}".format(host, self.probe_path)
+        start = time.monotonic()
+        try:
+            resp = httpx.head(url, timeout=self.probe_timeout)
+            ok = resp.status_code < 500
+        except httpx.HTTPError:
+            log.debug("Probe of %s failed", host)
+            ok = False
+        self.record(host, time.monotonic() - start, ok)
+        return ok
+
+    def probe_all(self):
+        """Probe all candidates concurrently."""
+        if self._explicit_hosts is None:
+            # pick up the changes of the mirror list once it expires
+            self._hosts = cached_hosts()
+        hosts = self.hosts
+        with ThreadPoolExecutor(max_workers=len(hosts) or 1) as executor:
+            list(executor.map(self.probe, hosts))
+
+    def ranked(self, hosts=None):
+        """
+        Args:
+            hosts (list, optional): Hostnames to rank instead of `hosts`.
+
+        Returns:
+            list: Hostnames, healthy and fast servers first.
+        """
+        if hosts is None:
+            hosts = self.hosts
+        with self._lock:
+            stats = [self._stats.get(h) or MirrorStats(h) for h in hosts]
+
+        def score(s):
+            return (s.error_rate > self.max_error_rate, s.latency, s.host)
+
+        return [s.host for s in sorted(stats, key=score)]
+
+    def best(self):
+        with self._lock:
+            probed = bool(self._stats)
+        if not probed:
+            self.probe_all()
+        return self.ranked()[0]
+
+    def best_url(self):
+        return "https://{}/".format(self.best())
+
+    def start(self):
+        """Re-rank the servers in a background thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="pyradios-mirrors", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.probe_all()
+            except Exception:
+                log.exception("Failed to rank Radio Browser servers")
+            self._stop.wait(self.interval)
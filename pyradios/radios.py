@@ -1,34 +1,391 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import httpx
 
+from pyradios.base_url import Error as DiscoveryError
+from pyradios.base_url import cached_hosts
+from pyradios.base_url import async_cached_hosts
+from pyradios.base_url import async_pick_base_url
 from pyradios.base_url import pick_base_url
+from pyradios.cache import ResponseCache
+from pyradios.decoders import json_decoder
+from pyradios.records import to_records
+from pyradios.retry import RetryPolicy
+from pyradios.routes import Router
+from pyradios.singleflight import AsyncSingleFlight
+from pyradios.singleflight import SingleFlight
+from pyradios.stream import ArrayParser
+from pyradios.utils import adapters
 from pyradios.utils import type_check
+from pyradios.utils import validators
 from pyradios.__about__ import __version__
 
 version = __version__
 
+log = logging.getLogger("pyradios")
+
 
 class Request:
-    def __init__(self, headers=None, session=None):
+    def __init__(
+        self,
+        headers=None,
+        session=None,
+        retry=None,
+        mirror_selector=None,
+        timeout=None,
+        limits=None,
+        http2=False,
+        cache=None,
+        decoder=None,
+        discover=True,
+    ):
         self._headers = headers
+        # look up mirrors to fail over to, off for an explicit server
+        self.discover = discover
+        self.cache = cache
+        self.decoder = decoder if decoder is not None else json_decoder()
+        self._timeout = timeout if timeout is not None else httpx.Timeout(5.0)
+        self._limits = limits if limits is not None else httpx.Limits()
+        self._http2 = http2
         self._session = self._init_session(session)
+        self.router = Router()
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.mirror_selector = mirror_selector
+        self.stats = {"requests": 0, "retries": 0, "failovers": 0}
+        self._stats_lock = threading.Lock()
+        self._flight = self._init_flight()
+
+    def _init_flight(self):
+        return SingleFlight()
 
     def _init_session(self, session):
         if session is None:
-            return httpx.Client()
+            return httpx.Client(
+                timeout=self._timeout, limits=self._limits, http2=self._http2
+            )
         return session
 
+    def _count(self, key):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def _record(self, url, start, ok):
+        if self.mirror_selector is not None:
+            host = self.router.url(url).host
+            self.mirror_selector.record(host, time.monotonic() - start, ok)
+
+    def _failover_hosts(self):
+        """Mirrors to fail over to, best first, or None."""
+        selector = self.mirror_selector
+        if selector is not None and not selector.discovers:
+            return selector.ranked()
+        if not self.discover:
+            return None
+        try:
+            hosts = cached_hosts()
+        except (OSError, DiscoveryError):
+            log.warning("No mirror to fail over to")
+            return None
+        return selector.ranked(hosts) if selector is not None else hosts
+
+    def _failover_url(self, url, attempt):
+        """Swap the server of `url` for the next known mirror."""
+        if not self.retry.failover:
+            return url
+        return self._swap_host(url, self._failover_hosts(), attempt)
+
+    def _swap_host(self, url, hosts, attempt):
+        if not hosts:
+            return url
+        current = self.router.url(url)
+        others = [h for h in hosts if h != current.host]
+        if current.host not in hosts or not others:
+            return url
+        host = others[(attempt - 1) % len(others)]
+        self._count("failovers")
+        log.info("Failing over from %s to %s", current.host, host)
+        return str(current.copy_with(host=host))
+
+    def _should_retry(self, attempt, response=None, error=None):
+        return (
+            attempt < self.retry.total
+            and self.retry.is_retryable("GET", response, error)
+            and self.retry.budget.withdraw()
+        )
+
+    def _decode(self, cache, key, url, resp, text=False):
+        data = resp.text if text else self.decoder(resp.content)
+        if cache is not None:
+            cache.set(key, url, data, resp.headers, len(resp.content))
+        return data
+
+    def _headers_for(self, entry):
+        if entry is None:
+            return self._headers
+        validators = entry.validators()
+        if not validators:
+            return self._headers
+        return {**(self._headers or {}), **validators}
+
     def get(self, url, **kwargs):
-        resp = self._session.get(url, headers=self._headers, params=kwargs)
-        if resp.status_code == 200:
-            return resp.json()
-        return resp.raise_for_status()
+        return self.fetch(url, kwargs)
+
+    def fetch(self, url, params, cache=True, text=False):
+        """Request `url` with the query `params`.
+
+        Args:
+            cache (bool, optional): Use the response cache, if any.
+            text (bool, optional): Return the body as text instead of
+                decoding it as JSON, e.g. for the csv format.
+        """
+        key = ResponseCache.key(url, params)
+        if params.get("order") == "random":
+            # every call asks for a new order
+            return self._fetch(key, url, params, None, text)
+        # identical concurrent calls share one round trip
+        cache = self.cache if cache else None
+        return self._flight.do(
+            key, self._fetch, key, url, params, cache, text
+        )
+
+    def _fetch(self, key, url, params, cache, text=False):
+        entry = cache.get(key) if cache is not None else None
+        if entry is not None and entry.fresh():
+            return entry.data
+        headers = self._headers_for(entry)
+        self._count("requests")
+        self.retry.budget.deposit()
+        attempt = 0
+        while True:
+            start = time.monotonic()
+            try:
+                resp = self._session.get(
+                    self.router.url(url, params), headers=headers
+                )
+            except httpx.TransportError as exc:
+                self._record(url, start, False)
+                if not self._should_retry(attempt, error=exc):
+                    raise
+                resp = None
+            else:
+                self._record(url, start, resp.status_code < 500)
+                if resp.status_code == 200:
+                    return self._decode(cache, key, url, resp, text)
+                if resp.status_code == 304 and entry is not None:
+                    return cache.revalidated(
+                        key, url, entry, resp.headers
+                    )
+                if not self._should_retry(attempt, response=resp):
+                    return resp.raise_for_status()
+            time.sleep(self.retry.backoff(attempt, resp))
+            attempt += 1
+            self._count("retries")
+            url = self._failover_url(url, attempt)
+
+    def stream(self, url, params):
+        """Request a JSON array, yielding the items while they arrive.
+
+        Streamed responses bypass the cache and are not retried.
+        """
+        self._count("requests")
+        with self._session.stream(
+            "GET", self.router.url(url, params), headers=self._headers
+        ) as resp:
+            resp.raise_for_status()
+            parser = ArrayParser()
+            for chunk in resp.iter_bytes():
+                yield from parser.feed(chunk)
+            yield from parser.close()
+
+    def download(self, url, params, path):
+        """Save the body of `url` to `path` without decoding it.
+
+        The body goes to a temporary file, renamed to `path` once
+        complete. Downloads bypass the cache and are not retried.
+
+        Returns:
+            int: Number of bytes written.
+        """
+        self._count("requests")
+        tmp = "{}.{}.tmp".format(path, os.getpid())
+        try:
+            with self._session.stream(
+                "GET", self.router.url(url, params), headers=self._headers
+            ) as resp:
+                resp.raise_for_status()
+                with open(tmp, "wb") as f:
+                    for chunk in resp.iter_bytes():
+                        f.write(chunk)
+                    size = f.tell()
+            os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        return size
+
+
+class AsyncRequest(Request):
+    def _init_flight(self):
+        return AsyncSingleFlight()
+
+    def _init_session(self, session):
+        if session is None:
+            return httpx.AsyncClient(
+                timeout=self._timeout, limits=self._limits, http2=self._http2
+            )
+        return session
+
+    async def _failover_hosts(self):
+        # same as Request._failover_hosts, discovering on the event loop
+        selector = self.mirror_selector
+        if selector is not None and not selector.discovers:
+            return selector.ranked()
+        if not self.discover:
+            return None
+        try:
+            hosts = await async_cached_hosts()
+        except (OSError, DiscoveryError):
+            log.warning("No mirror to fail over to")
+            return None
+        return selector.ranked(hosts) if selector is not None else hosts
+
+    async def _failover_url(self, url, attempt):
+        if not self.retry.failover:
+            return url
+        hosts = await self._failover_hosts()
+        return self._swap_host(url, hosts, attempt)
+
+    async def get(self, url, **kwargs):
+        return await self.fetch(url, kwargs)
+
+    async def fetch(self, url, params, cache=True, text=False):
+        """Request `url` with the query `params`, see `Request.fetch`."""
+        key = ResponseCache.key(url, params)
+        if params.get("order") == "random":
+            # every call asks for a new order
+            return await self._fetch(key, url, params, None, text)
+        # identical concurrent calls share one round trip
+        cache = self.cache if cache else None
+        return await self._flight.do(
+            key, self._fetch, key, url, params, cache, text
+        )
+
+    async def _fetch(self, key, url, params, cache, text=False):
+        entry = cache.get(key) if cache is not None else None
+        if entry is not None and entry.fresh():
+            return entry.data
+        headers = self._headers_for(entry)
+        self._count("requests")
+        self.retry.budget.deposit()
+        attempt = 0
+        while True:
+            start = time.monotonic()
+            try:
+                resp = await self._session.get(
+                    self.router.url(url, params), headers=headers
+                )
+            except httpx.TransportError as exc:
+                self._record(url, start, False)
+                if not self._should_retry(attempt, error=exc):
+                    raise
+                resp = None
+            else:
+                self._record(url, start, resp.status_code < 500)
+                if resp.status_code == 200:
+                    return self._decode(cache, key, url, resp, text)
+                if resp.status_code == 304 and entry is not None:
+                    return cache.revalidated(
+                        key, url, entry, resp.headers
+                    )
+                if not self._should_retry(attempt, response=resp):
+                    return resp.raise_for_status()
+            await asyncio.sleep(self.retry.backoff(attempt, resp))
+            attempt += 1
+            self._count("retries")
+            url = await self._failover_url(url, attempt)
+
+    async def stream(self, url, params):
+        self._count("requests")
+        async with self._session.stream(
+            "GET", self.router.url(url, params), headers=self._headers
+        ) as resp:
+            resp.raise_for_status()
+            parser = ArrayParser()
+            async for chunk in resp.aiter_bytes():
+                for item in parser.feed(chunk):
+                    yield item
+            for item in parser.close():
+                yield item
+
+    async def download(self, url, params, path):
+        self._count("requests")
+        tmp = "{}.{}.tmp".format(path, os.getpid())
+        try:
+            async with self._session.stream(
+                "GET", self.router.url(url, params), headers=self._headers
+            ) as resp:
+                resp.raise_for_status()
+                with open(tmp, "wb") as f:
+                    async for chunk in resp.aiter_bytes():
+                        f.write(chunk)
+                    size = f.tell()
+            os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        return size
+
+    async def aclose(self):
+        await self._session.aclose()
 
 
 class RadioBrowser:
     """This class implements the main interface for the Radio Browser API.
 
     Args:
-        session (obj, optional): The `requests_cache.CachedSession` instance.
+        session (obj, optional): The `httpx.Client` instance.
+        base_url (str, optional): Use this server instead of discovering
+            one. Discovery is deferred until the first request and the
+            mirror list is cached, see `base_url.cached_hosts`.
+        mirror_selector (obj, optional): A `mirrors.MirrorSelector` that
+            picks the fastest healthy server for every request.
+        retry (obj, optional): A `retry.RetryPolicy`. Failed requests are
+            retried against other mirrors, see `Request.stats` for the
+            number of retries and failovers.
+        timeout (float, optional): Seconds to wait for a read, write or
+            pool connection. Defaults to 5.
+        connect_timeout (float, optional): Seconds to wait for a
+            connection. Defaults to `timeout`.
+        max_connections (int, optional): Size of the connection pool.
+        max_keepalive_connections (int, optional): Idle connections kept
+            open for reuse.
+        keepalive_expiry (float, optional): Seconds an idle connection is
+            kept open.
+        http2 (bool, optional): Multiplex requests over HTTP/2. Run
+            `pip install pyradios[http2]` to enable it.
+        cache (obj, optional): A `cache.ResponseCache`, or `True` for one
+            in memory. Cached responses are shared by the calls, do not
+            modify them. Defaults to no cache.
+        records (bool, optional): Return `records.Station`,
+            `records.Country`, `records.Tag` and `records.Codec` objects
+            instead of dicts. They take less memory and support the dict
+            item access. Defaults to False.
+        validate (bool, optional): Check the arguments of the search and
+            list methods. Trusted callers on a hot path can disable it.
+            Defaults to True.
+        decoder (callable, optional): Decodes the JSON responses from
+            bytes. Defaults to the fastest one installed, see
+            `decoders.json_decoder`.
+        fmt (str, optional): Format of the responses, one of `FORMATS`,
+            which every method can override with its own `fmt` argument.
+            Other formats than json are returned as text; m3u and pls
+            only apply to lists of stations. Paging, streaming, clicks
+            and the lookups by uuids always use json. Defaults to json.
 
     Examples:
 
@@ -36,42 +393,127 @@ class RadioBrowser:
         >>> rb = pyradios.RadioBrowser()
         >>> rb.countries()
 
-        To create an instance of the RadioBrowser class with cached session.
+        To create an instance of the RadioBrowser class with a persistent
+        cache, keeping search results for one minute.
 
         >>> from pyradios import RadioBrowser
-        >>> from requests_cache import CachedSession
-        >>> import datetime
-        >>> from datetime import timedelta
-        >>> expire_after = timedelta(days=3)
-        >>> session = CachedSession(
-        ...     cache_name='cache',
-        ...     backend='sqlite',
-        ...     expire_after=expire_after)
-        >>> rb = RadioBrowser(session=session)
+        >>> from pyradios.cache import ResponseCache, SQLiteCache
+        >>> cache = ResponseCache(
+        ...     SQLiteCache('cache.sqlite'),
+        ...     ttls={'stations/search': 60})
+        >>> rb = RadioBrowser(cache=cache)
         >>> rb.countries()
+        >>> rb.client.cache.stats
+        {'hits': 0, 'misses': 1, 'revalidated': 0}
 
     Note:
-        Run `pip install requests_cache` to use cached session.
+        The connection options are ignored when `session` is given.
+
+        Identical calls made at the same time share one request. Each
+        caller gets its own list, but the stations in it are shared,
+        modify copies of them.
 
     """
 
     headers = {"User-Agent": "pyradios/{}".format(version)}
 
-    def __init__(self, session=None, **kwargs):
-        self.base_url = pick_base_url()
-        self._fmt = 'json'
-        self.client = Request(headers=self.headers, session=session)
+    request_class = Request
+
+    FORMATS = ("json", "csv", "xml", "m3u", "pls")
+
+    def __init__(
+        self,
+        session=None,
+        base_url=None,
+        mirror_selector=None,
+        retry=None,
+        timeout=5.0,
+        connect_timeout=None,
+        max_connections=100,
+        max_keepalive_connections=20,
+        keepalive_expiry=5.0,
+        http2=False,
+        cache=False,
+        records=False,
+        validate=True,
+        decoder=None,
+        fmt="json",
+        **kwargs
+    ):
+        self._base_url = base_url
+        self.mirror_selector = mirror_selector
+        self.records = records
+        self._validate = validate
+        self._fmt = self._check_format(fmt)
+        if connect_timeout is None:
+            connect_timeout = timeout
+        if cache is True:
+            cache = ResponseCache()
+        self.client = self.request_class(
+            headers=self.headers,
+            session=session,
+            retry=retry,
+            mirror_selector=mirror_selector,
+            timeout=httpx.Timeout(timeout, connect=connect_timeout),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            http2=http2,
+            cache=cache or None,
+            decoder=decoder,
+            discover=base_url is None,
+        )
+
+    @property
+    def base_url(self):
+        if self._base_url is None and self.mirror_selector is not None:
+            return self.mirror_selector.best_url()
+        if self._base_url is None:
+            self._base_url = pick_base_url()
+        return self._base_url
+
+    @base_url.setter
+    def base_url(self, url):
+        self._base_url = url
+        self.client.discover = url is None
 
     def build_url(self, endpoint):
         url = self.base_url + endpoint
         return url
 
+    def _check_format(self, fmt):
+        if fmt not in self.FORMATS:
+            raise ValueError("Unknown format {!r}".format(fmt))
+        return fmt
+
+    def _format(self, endpoint, fmt):
+        # endpoints are written as json ones, the formats share the paths
+        if fmt == "json":
+            return endpoint
+        return self._check_format(fmt) + endpoint[len("json"):]
+
+    def _get(self, endpoint, fmt=None, **kwargs):
+        fmt = fmt or self._fmt
+        url = self.build_url(self._format(endpoint, fmt))
+        if fmt != "json":
+            return self.client.fetch(url, kwargs, text=True)
+        return self._records(endpoint, self.client.get(url, **kwargs))
+
+    def _records(self, endpoint, data):
+        if not self.records:
+            return data
+        return to_records(endpoint, data)
+
     @type_check
-    def countries(self, code=None):
+    def countries(self, code=None, fmt=None):
         """Lists all countries.
 
         Args:
             code (str, optional): Filter by country code. Defaults to None.
+            fmt (str, optional): Format of the response, one of
+                `FORMATS`. Defaults to the format of the client.
 
         Returns:
             list: Countries.
@@ -86,15 +528,16 @@ class RadioBrowser:
             )
         else:
             endpoint = "json/countries/"
-        url = self.build_url(endpoint)
-        return self.client.get(url)
+        return self._get(endpoint, fmt=fmt)
 
     @type_check
-    def countrycodes(self, code=None):
+    def countrycodes(self, code=None, fmt=None):
         """Lists all countries.
 
         Args:
             code (str, optional): Filter by country code. Defaults to None.
+            fmt (str, optional): Format of the response, one of
+                `FORMATS`. Defaults to the format of the client.
 
         Returns:
             list: Countries.
@@ -109,15 +552,16 @@ class RadioBrowser:
             )
         else:
             endpoint = "json/countrycodes/"
-        url = self.build_url(endpoint)
-        return self.client.get(url)
+        return self._get(endpoint, fmt=fmt)
 
     @type_check
-    def codecs(self, codec=None):
+    def codecs(self, codec=None, fmt=None):
         """Lists all codecs.
 
         Args:
             codec (str, optional): Filter by codec. Defaults to None.
+            fmt (str, optional): Format of the response, one of
+                `FORMATS`. Defaults to the format of the client.
 
         Returns:
             list: Codecs.
@@ -130,16 +574,17 @@ class RadioBrowser:
         else:
             endpoint = "json/codecs/"
 
-        url = self.build_url(endpoint)
-        return self.client.get(url)
+        return self._get(endpoint, fmt=fmt)
 
     @type_check
-    def states(self, country=None, state=None):
+    def states(self, country=None, state=None, fmt=None):
         """Lists all states.
 
         Args:
             country (str, optional): Filter by country. Defaults to None.
             state (str, optionla): Filter by state.  Defaults to None.
+            fmt (str, optional): Format of the response, one of
+                `FORMATS`. Defaults to the format of the client.
 
         Returns:
             list: States.
@@ -157,15 +602,16 @@ class RadioBrowser:
         elif state:
             endpoint += "{}".format(state.title())
 
-        url = self.build_url(endpoint)
-        return self.client.get(url)
+        return self._get(endpoint, fmt=fmt)
 
     @type_check
-    def languages(self, language=None):
+    def languages(self, language=None, fmt=None):
         """Lists all languages.
 
         Args:
             language (str, optional): Filter by language. Defaults to None.
+            fmt (str, optional): Format of the response, one of
+                `FORMATS`. Defaults to the format of the client.
 
         Returns:
             list: Languages.
@@ -179,15 +625,16 @@ class RadioBrowser:
             )
         else:
             endpoint = "json/languages/"
-        url = self.build_url(endpoint)
-        return self.client.get(url)
+        return self._get(endpoint, fmt=fmt)
 
     @type_check
-    def tags(self, tag=None):
+    def tags(self, tag=None, fmt=None):
         """Lists all tags.
 
         Args:
             tag (str, optional): Filter by tag. Defaults to None.
+            fmt (str, optional): Format of the response, one of
+                `FORMATS`. Defaults to the format of the client.
 
         Returns:
             list: Tags.
@@ -201,14 +648,15 @@ class RadioBrowser:
             endpoint = "json/tags/{tag}".format(tag=tag)
         else:
             endpoint = "json/tags/"
-        url = self.build_url(endpoint)
-        return self.client.get(url)
+        return self._get(endpoint, fmt=fmt)
 
-    def station_by_uuid(self, stationuuid):
+    def station_by_uuid(self, stationuuid, fmt=None):
         """Radio station by stationuuid.
 
         Args:
             stationuuid (str): A globally unique identifier for the station.
+            fmt (str, optional): Format of the response, one of
+                `FORMATS`. Defaults to the format of the client.
 
         Returns:
             list: Stations.
@@ -219,8 +667,97 @@ class RadioBrowser:
         endpoint = "json/stations/byuuid/{uuid}".format(
             uuid=stationuuid
         )
-        url = self.build_url(endpoint)
-        return self.client.get(url)
+        return self._get(endpoint, fmt=fmt)
+
+    def stations_by_uuids(self, uuids, chunk_size=100, max_workers=4):
+        """Radio stations by many stationuuids.
+
+        The uuids are sent in chunks of `chunk_size` per request, and
+        the chunks are requested concurrently.
+
+        Args:
+            uuids (list): Globally unique identifiers of the stations.
+            chunk_size (int, optional): Number of uuids per request.
+            max_workers (int, optional): Number of concurrent requests.
+
+        Returns:
+            list: Stations in the order of `uuids`, None for each uuid
+                without a station.
+
+        See details:
+            https://de1.api.radio-browser.info/#List_of_radio_stations
+        """
+        uuids = list(uuids)
+        chunks = self._chunks(uuids, chunk_size)
+        if len(chunks) <= 1:
+            pages = [self._stations_by_chunk(c) for c in chunks]
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                pages = list(executor.map(self._stations_by_chunk, chunks))
+        return self._in_order(uuids, pages)
+
+    def gather(self, calls, max_concurrency=8, return_exceptions=True):
+        """Run many calls concurrently over the shared connection pool.
+
+        Args:
+            calls (list): The calls to make. A call is a method name
+                followed by its arguments, optionally ending with a dict
+                of keyword arguments, or any callable without arguments.
+            max_concurrency (int, optional): Maximum calls in flight.
+            return_exceptions (bool, optional): Return the exception of a
+                failed call in its place. Otherwise the first exception
+                is raised.
+
+        Returns:
+            list: Results in the order of `calls`.
+
+        Example:
+            >>> from pyradios import RadioBrowser
+            >>> rb = RadioBrowser()
+            >>> countries, jazz, top = rb.gather([
+            ...     ('countries',),
+            ...     ('stations_by_tag', 'jazz', {'limit': 10}),
+            ...     ('stations_by_votes', 10),
+            ... ])
+        """
+        calls = [self._bind(call) for call in calls]
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            futures = [executor.submit(call) for call in calls]
+            results = []
+            for future in futures:
+                try:
+                    results.append(future.result())
+                except Exception as exc:
+                    if not return_exceptions:
+                        raise
+                    results.append(exc)
+        return results
+
+    def _bind(self, call):
+        """Turn a call given to `gather` into a callable."""
+        if callable(call):
+            return call
+        name, *args = call
+        kwargs = args.pop() if args and isinstance(args[-1], dict) else {}
+        method = getattr(self, name)
+        return lambda: method(*args, **kwargs)
+
+    @staticmethod
+    def _chunks(uuids, chunk_size):
+        # the same uuid only needs to be requested once
+        unique = list(dict.fromkeys(uuids))
+        return [
+            unique[i:i + chunk_size] for i in range(0, len(unique), chunk_size)
+        ]
+
+    def _stations_by_chunk(self, chunk):
+        endpoint = "json/stations/byuuid"
+        return self._get(endpoint, fmt="json", uuids=",".join(chunk))
+
+    @staticmethod
+    def _in_order(uuids, pages):
+        found = {s["stationuuid"]: s for page in pages for s in page}
+        return [found.get(uuid) for uuid in uuids]
 
     def stations_by_name(self, name, exact=False, **kwargs):
         """Lists all radio stations by name.
@@ -362,8 +899,7 @@ class RadioBrowser:
             https://de1.api.radio-browser.info/#Count_station_click
         """
         endpoint = "json/url/{uuid}".format(uuid=stationuuid)
-        url = self.build_url(endpoint)
-        return self.client.get(url)
+        return self._get(endpoint, fmt="json")
 
     def stations(self, **kwargs):
         """Lists all radio stations.
@@ -375,8 +911,7 @@ class RadioBrowser:
             https://nl1.api.radio-browser.info/#List_of_all_radio_stations
         """
         endpoint = "json/stations"
-        url = self.build_url(endpoint)
-        return self.client.get(url, **kwargs)
+        return self._get(endpoint, **kwargs)
 
     def stations_by_votes(self, limit, **kwargs):
         """A list of the highest-voted stations.
@@ -391,8 +926,26 @@ class RadioBrowser:
             https://nl1.api.radio-browser.info/#Stations_by_votes
         """
         endpoint = "json/stations/topvote/{limit}".format(limit=limit)
-        url = self.build_url(endpoint)
-        return self.client.get(url, **kwargs)
+        return self._get(endpoint, **kwargs)
+
+    def stations_changed(self, lastchangeuuid=None, **kwargs):
+        """A list of station changes, oldest first.
+
+        Args:
+            lastchangeuuid (str, optional): Only changes made after the
+                change with this changeuuid.
+            limit (int, optional): Number of returned changes.
+
+        Returns:
+            list: Stations, as they were after each change.
+
+        See details:
+            https://de1.api.radio-browser.info/#List_of_station_changes
+        """
+        endpoint = "json/stations/changed"
+        if lastchangeuuid:
+            kwargs["lastchangeuuid"] = lastchangeuuid
+        return self._get(endpoint, **kwargs)
 
     @type_check
     def search(self, **kwargs):
@@ -436,6 +989,8 @@ class RadioBrowser:
             limit (int, optional): Number of returned datarows (stations)
                 starting with offset (default 100000)
             hidebroken (bool, optional): do list/not list broken stations.
+            fmt (str, optional): Format of the response, one of
+                `FORMATS`. Defaults to the format of the client.
 
         Returns:
             list: Stations.
@@ -449,9 +1004,273 @@ class RadioBrowser:
             https://de1.api.radio-browser.info/#Advanced_station_search
         """
         endpoint = "json/stations/search"
+        kwargs = self._lowercase_tags(kwargs)
+        return self._get(endpoint, **kwargs)
+
+    @staticmethod
+    def _lowercase_tags(params):
         # lowercase tag reference since the API turned to be case-sensitive
         for paramkey in ['tag', 'tagList']:
-            if paramkey in kwargs:
-                kwargs[paramkey] = kwargs[paramkey].lower()
+            if paramkey in params:
+                params[paramkey] = params[paramkey].lower()
+        return params
+
+    def _search_params(self, kwargs):
+        if self._validate:
+            validators['search'](kwargs)
+        return self._lowercase_tags(adapters['search'](kwargs))
+
+    def iter_search(self, page_size=1000, prefetch=False, **kwargs):
+        """Advanced search, fetching the stations page by page.
+
+        It takes the same arguments as `search`, with `offset` and `limit`
+        applying to the whole iteration. Pages bypass the response cache,
+        so memory use does not grow with the number of stations.
+
+        Args:
+            page_size (int, optional): Number of stations per request.
+            prefetch (bool, optional): Request the next page while the
+                current one is consumed.
+
+        Yields:
+            dict: Station.
+
+        Example:
+            >>> from pyradios import RadioBrowser
+            >>> rb = RadioBrowser()
+            >>> for station in rb.iter_search(countrycode='BE'):
+            ...     print(station['name'])
+        """
+        params = self._search_params(kwargs)
+        endpoint = "json/stations/search"
+        return self._pages(endpoint, params, page_size, prefetch)
+
+    def iter_stations(self, page_size=1000, prefetch=False, **kwargs):
+        """Lists all radio stations, fetching them page by page.
+
+        See `iter_search` for the arguments.
+
+        Yields:
+            dict: Station.
+        """
+        params = adapters['search'](kwargs)
+        endpoint = "json/stations"
+        return self._pages(endpoint, params, page_size, prefetch)
+
+    def stream_search(self, **kwargs):
+        """Advanced search, yielding stations while the response arrives.
+
+        It takes the same arguments as `search`. The response is parsed
+        incrementally, so memory use is proportional to one station and
+        the first station is available before the download finishes.
+
+        Yields:
+            dict: Station.
+        """
+        params = self._search_params(kwargs)
+        return self._stream("json/stations/search", params)
+
+    def stream_stations(self, **kwargs):
+        """Lists all radio stations, yielding them while they arrive.
+
+        See `stream_search`.
+
+        Yields:
+            dict: Station.
+        """
+        params = adapters['search'](kwargs)
+        return self._stream("json/stations", params)
+
+    def download_stations(self, path, fmt="csv", **kwargs):
+        """Save the stations to `path`, as sent by the server.
+
+        The response is streamed to disk without being decoded, the file
+        is replaced once the download is complete.
+
+        Args:
+            path (str): Destination file.
+            fmt (str, optional): One of `FORMATS`. Defaults to csv.
+            **kwargs: Arguments of `search` to only save the matching
+                stations. All stations are saved without them.
+
+        Returns:
+            int: Number of bytes written.
+
+        Example:
+            >>> from pyradios import RadioBrowser
+            >>> rb = RadioBrowser()
+            >>> rb.download_stations('stations.csv')
+            >>> rb.download_stations('jazz.m3u', fmt='m3u', tag='jazz')
+        """
+        endpoint, params = self._download_params(fmt, kwargs)
+        return self.client.download(self.build_url(endpoint), params, path)
+
+    def _download_params(self, fmt, kwargs):
+        if kwargs:
+            endpoint = "json/stations/search"
+            params = self._search_params(kwargs)
+        else:
+            endpoint, params = "json/stations", {}
+        return self._format(endpoint, self._check_format(fmt)), params
+
+    def _stream(self, endpoint, params):
+        items = self.client.stream(self.build_url(endpoint), params)
+        for item in items:
+            yield self._records(endpoint, item)
+
+    @staticmethod
+    def _page_size(page_size, remaining):
+        if remaining is None:
+            return page_size
+        return min(page_size, remaining)
+
+    def _pages(self, endpoint, params, page_size, prefetch):
         url = self.build_url(endpoint)
-        return self.client.get(url, **kwargs)
+        offset = int(params.pop("offset", 0))
+        remaining = params.pop("limit", None)
+        if remaining is not None:
+            remaining = int(remaining)
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+
+        def request(offset, size):
+            page = dict(params, offset=offset, limit=size)
+            if executor is None:
+                return lambda: self.client.fetch(url, page, cache=False)
+            return executor.submit(
+                self.client.fetch, url, page, cache=False
+            ).result
+
+        try:
+            size = self._page_size(page_size, remaining)
+            pending = request(offset, size) if size > 0 else None
+            while pending is not None:
+                stations = pending()
+                offset += len(stations)
+                if remaining is not None:
+                    remaining -= len(stations)
+                pending = None
+                if len(stations) == size and remaining != 0:
+                    size = self._page_size(page_size, remaining)
+                    pending = request(offset, size)
+                yield from self._records(endpoint, stations)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+
+class AsyncRadioBrowser(RadioBrowser):
+    """Asynchronous interface for the Radio Browser API.
+
+    It has the same methods and arguments as `RadioBrowser`, built on
+    `httpx.AsyncClient`, and every method returns a coroutine. Server
+    discovery runs on the event loop, see `base_url.async_cached_hosts`.
+
+    Args:
+        session (obj, optional): The `httpx.AsyncClient` instance.
+
+    Examples:
+
+        >>> import asyncio
+        >>> from pyradios import AsyncRadioBrowser
+        >>> async def main():
+        ...     async with AsyncRadioBrowser() as rb:
+        ...         return await asyncio.gather(
+        ...             rb.countries(), rb.stations_by_tag("jazz")
+        ...         )
+        >>> countries, jazz = asyncio.run(main())
+    """
+
+    request_class = AsyncRequest
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    async def resolve_base_url(self):
+        if self._base_url is None and self.mirror_selector is not None:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                None, self.mirror_selector.best_url
+            )
+        if self._base_url is None:
+            self._base_url = await async_pick_base_url()
+        return self._base_url
+
+    async def _get(self, endpoint, fmt=None, **kwargs):
+        fmt = fmt or self._fmt
+        url = await self.resolve_base_url() + self._format(endpoint, fmt)
+        if fmt != "json":
+            return await self.client.fetch(url, kwargs, text=True)
+        data = await self.client.get(url, **kwargs)
+        return self._records(endpoint, data)
+
+    async def download_stations(self, path, fmt="csv", **kwargs):
+        endpoint, params = self._download_params(fmt, kwargs)
+        url = await self.resolve_base_url() + endpoint
+        return await self.client.download(url, params, path)
+
+    async def gather(self, calls, max_concurrency=8, return_exceptions=True):
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run(call):
+            async with semaphore:
+                return await call()
+
+        return await asyncio.gather(
+            *(run(self._bind(call)) for call in calls),
+            return_exceptions=return_exceptions,
+        )
+
+    async def stations_by_uuids(self, uuids, chunk_size=100, max_workers=4):
+        uuids = list(uuids)
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def fetch(chunk):
+            async with semaphore:
+                return await self._stations_by_chunk(chunk)
+
+        chunks = self._chunks(uuids, chunk_size)
+        pages = await asyncio.gather(*(fetch(c) for c in chunks))
+        return self._in_order(uuids, pages)
+
+    async def _stream(self, endpoint, params):
+        url = await self.resolve_base_url() + endpoint
+        async for item in self.client.stream(url, params):
+            yield self._records(endpoint, item)
+
+    async def _pages(self, endpoint, params, page_size, prefetch):
+        url = await self.resolve_base_url() + endpoint
+        offset = int(params.pop("offset", 0))
+        remaining = params.pop("limit", None)
+        if remaining is not None:
+            remaining = int(remaining)
+
+        def request(offset, size):
+            page = dict(params, offset=offset, limit=size)
+            coro = self.client.fetch(url, page, cache=False)
+            return asyncio.ensure_future(coro) if prefetch else coro
+
+        size = self._page_size(page_size, remaining)
+        pending = request(offset, size) if size > 0 else None
+        try:
+            while pending is not None:
+                stations = await pending
+                offset += len(stations)
+                if remaining is not None:
+                    remaining -= len(stations)
+                pending = None
+                if len(stations) == size and remaining != 0:
+                    size = self._page_size(page_size, remaining)
+                    pending = request(offset, size)
+                for station in self._records(endpoint, stations):
+                    yield station
+        finally:
+            if asyncio.isfuture(pending):
+                pending.cancel()
+            elif pending is not None:
+                pending.close()
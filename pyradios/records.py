@@ -0,0 +1,180 @@
+"""
+This module holds compact record types for `Radio Browser` results.
+"""
+import sys
+
+
+class Record:
+    """Base class of the records, built from a dict of the API.
+
+    Records use `__slots__` instead of a dict per item, repeated values
+    like codecs and country codes are interned so every record shares
+    the same string object. Records also support `record['name']` and
+    `record.get('name')`, so code written for dicts keeps working.
+    """
+
+    __slots__ = ()
+
+    # fields whose values repeat across records
+    interned = frozenset()
+
+    def __init__(self, **kwargs):
+        for field in self.__slots__:
+            value = kwargs.get(field)
+            if field in self.interned and isinstance(value, str):
+                value = sys.intern(value)
+            setattr(self, field, value)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+    def __repr__(self):
+        return "{}(name={!r})".format(type(self).__name__, self.name)
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(
+            getattr(self, f) == getattr(other, f) for f in self.__slots__
+        )
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key):
+        return key in self.__slots__
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return iter(self.__slots__)
+
+    def to_dict(self):
+        return {field: self[field] for field in self.__slots__}
+
+
+class Station(Record):
+    """A radio station.
+
+    `tags` is a tuple of the station tags, `station['tags']` still gives
+    the comma separated string of the API.
+    """
+
+    __slots__ = (
+        "changeuuid",
+        "stationuuid",
+        "serveruuid",
+        "name",
+        "url",
+        "url_resolved",
+        "homepage",
+        "favicon",
+        "tags",
+        "country",
+        "countrycode",
+        "iso_3166_2",
+        "state",
+        "language",
+        "languagecodes",
+        "votes",
+        "lastchangetime",
+        "lastchangetime_iso8601",
+        "codec",
+        "bitrate",
+        "hls",
+        "lastcheckok",
+        "lastchecktime",
+        "lastchecktime_iso8601",
+        "lastcheckoktime",
+        "lastcheckoktime_iso8601",
+        "lastlocalchecktime",
+        "lastlocalchecktime_iso8601",
+        "clicktimestamp",
+        "clicktimestamp_iso8601",
+        "clickcount",
+        "clicktrend",
+        "ssl_error",
+        "geo_lat",
+        "geo_long",
+        "geo_distance",
+        "has_extended_info",
+    )
+
+    interned = frozenset(
+        [
+            "serveruuid",
+            "country",
+            "countrycode",
+            "iso_3166_2",
+            "state",
+            "language",
+            "languagecodes",
+            "codec",
+        ]
+    )
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        tags = self.tags
+        if isinstance(tags, str):
+            tags = tuple(sys.intern(t) for t in tags.split(",") if t)
+        self.tags = tags or ()
+
+    def __getitem__(self, key):
+        if key == "tags":
+            return ",".join(self.tags)
+        return super().__getitem__(key)
+
+
+class Country(Record):
+    __slots__ = ("name", "iso_3166_1", "stationcount")
+
+    interned = frozenset(["name", "iso_3166_1"])
+
+
+class Tag(Record):
+    __slots__ = ("name", "stationcount")
+
+    interned = frozenset(["name"])
+
+
+class Codec(Record):
+    __slots__ = ("name", "stationcount")
+
+    interned = frozenset(["name"])
+
+
+# record type by endpoint (without the format prefix)
+RECORD_TYPES = {
+    "stations": Station,
+    "countries": Country,
+    "tags": Tag,
+    "codecs": Codec,
+}
+
+
+def record_type(endpoint):
+    """Record type of the items of `endpoint`, e.g. `json/stations/search`.
+
+    Returns:
+        type: A `Record` subclass or None.
+    """
+    parts = endpoint.strip("/").split("/")
+    return RECORD_TYPES.get(parts[1]) if len(parts) > 1 else None
+
+
+def to_records(endpoint, data):
+    """Convert the decoded response of `endpoint` to records."""
+    cls = record_type(endpoint)
+    if cls is None:
+        return data
+    if isinstance(data, dict):
+        return cls.from_dict(data)
+    return [cls.from_dict(item) for item in data]
@@ -0,0 +1,96 @@
+"""
+This module decides when and how failed requests are retried.
+"""
+import random
+import threading
+
+import httpx
+
+
+class RetryBudget:
+    """Caps retries to a fraction of the requests made.
+
+    Every request deposits `ratio` tokens and every retry withdraws one,
+    so a struggling service never sees more than `1 + ratio` times the
+    normal load. `min_tokens` allows some retries on a cold client.
+    """
+
+    def __init__(self, ratio=0.2, min_tokens=10):
+        self.ratio = ratio
+        self.max_tokens = max(min_tokens, 1)
+        self._tokens = float(min_tokens)
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def withdraw(self):
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class RetryPolicy:
+    """Retry policy for idempotent requests.
+
+    Args:
+        total (int, optional): Maximum number of retries per request.
+        backoff_factor (float, optional): Base of the exponential backoff
+            in seconds, the n-th retry waits up to `factor * 2 ** n`.
+        max_backoff (float, optional): Upper bound of a single wait.
+        jitter (bool, optional): Wait a random time up to the backoff
+            ("full jitter") instead of the backoff itself.
+        status_forcelist (tuple, optional): Status codes worth a retry.
+        failover (bool, optional): Retry against another server.
+        budget (RetryBudget, optional): Shared limit of retries.
+
+    Examples:
+
+        >>> from pyradios import RadioBrowser
+        >>> from pyradios.retry import RetryPolicy
+        >>> rb = RadioBrowser(retry=RetryPolicy(total=5))
+        >>> rb.client.stats
+        {'requests': 0, 'retries': 0, 'failovers': 0}
+    """
+
+    methods = frozenset(["GET", "HEAD"])
+
+    def __init__(
+        self,
+        total=2,
+        backoff_factor=0.1,
+        max_backoff=5.0,
+        jitter=True,
+        status_forcelist=(429, 500, 502, 503, 504),
+        failover=True,
+        budget=None,
+    ):
+        self.total = total
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.status_forcelist = frozenset(status_forcelist)
+        self.failover = failover
+        self.budget = budget if budget is not None else RetryBudget()
+
+    def is_retryable(self, method, response=None, error=None):
+        if method.upper() not in self.methods:
+            return False
+        if error is not None:
+            return isinstance(error, httpx.TransportError)
+        return response.status_code in self.status_forcelist
+
+    def backoff(self, attempt, response=None):
+        """Seconds to wait before the retry number `attempt` (from 0)."""
+        wait = min(self.max_backoff, self.backoff_factor * 2 ** attempt)
+        if self.jitter:
+            wait = random.uniform(0, wait)
+        if response is None:
+            return wait
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            wait = max(wait, min(self.max_backoff, int(retry_after)))
+        return wait
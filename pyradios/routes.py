@@ -0,0 +1,51 @@
+"""
+This module builds the URLs of the requests.
+"""
+from functools import lru_cache
+
+import httpx
+
+
+class Router:
+    """Build request URLs, reusing them for repeated calls.
+
+    Parsing the URL and encoding the query take most of the time httpx
+    spends building a request. Both are cached here: each server and
+    endpoint is parsed once into an `httpx.URL`, and each parameter set
+    is encoded once into the URL sent, so repeating a `search` costs a
+    dict lookup.
+
+    Args:
+        maxsize (int, optional): Number of URLs kept, least recently used
+            first out.
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._parse = lru_cache(maxsize)(httpx.URL)
+        self._build = lru_cache(maxsize)(self._build_url)
+
+    def _build_url(self, url, items):
+        return self._parse(url).copy_merge_params(dict(items))
+
+    def url(self, url, params=None):
+        """The `httpx.URL` of `url` with the query `params`.
+
+        Args:
+            url (str): URL without query.
+            params (dict, optional): Query parameters.
+
+        Returns:
+            httpx.URL: Shared by the calls with equal arguments.
+        """
+        if not params:
+            return self._parse(url)
+        try:
+            return self._build(url, tuple(params.items()))
+        except TypeError:
+            # unhashable values, e.g. lists for repeated parameters
+            return self._parse(url).copy_merge_params(params)
+
+    def clear(self):
+        self._parse.cache_clear()
+        self._build.cache_clear()
@@ -0,0 +1,75 @@
+"""
+This module deduplicates identical calls that are in flight at once.
+"""
+import asyncio
+import copy
+import threading
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Share one execution of a function among concurrent callers.
+
+    The first caller for a `key` runs the function, callers arriving
+    while it runs wait for it and receive the same exception or a
+    shallow copy of the result, e.g. their own list of stations, so
+    reordering it does not affect the other callers.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn, *args, **kwargs):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.copy(call.result)
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+
+class AsyncSingleFlight:
+    """Asynchronous version of `SingleFlight` for one event loop."""
+
+    def __init__(self):
+        self._calls = {}
+
+    async def do(self, key, fn, *args, **kwargs):
+        future = self._calls.get(key)
+        if future is not None:
+            # a cancelled waiter must not cancel the shared call
+            return copy.copy(await asyncio.shield(future))
+
+        future = asyncio.ensure_future(fn(*args, **kwargs))
+        self._calls[key] = future
+        future.add_done_callback(lambda _: self._forget(key, future))
+        return await asyncio.shield(future)
+
+    def _forget(self, key, future):
+        if self._calls.get(key) is future:
+            del self._calls[key]
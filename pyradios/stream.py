@@ -0,0 +1,93 @@
+"""
+This module parses JSON arrays incrementally, item by item.
+"""
+import codecs
+import json
+
+
+_WHITESPACE = " \t\n\r"
+
+
+class ArrayParser:
+    """Incremental parser of a JSON array.
+
+    Feed it the response body chunk by chunk, it returns the items that
+    are complete so far. Only the current item is ever buffered, so the
+    memory used is proportional to the largest item, not to the array.
+
+    Examples:
+
+        >>> parser = ArrayParser()
+        >>> parser.feed(b'[{"name": "a"}, {"na')
+        [{'name': 'a'}]
+        >>> parser.feed(b'me": "b"}]')
+        [{'name': 'b'}]
+        >>> parser.close()
+        []
+    """
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._started = False
+        self._finished = False
+
+    def feed(self, chunk, final=False):
+        """
+        Returns:
+            list: Items completed by `chunk`.
+        """
+        self._buffer += self._utf8.decode(chunk, final)
+        items = []
+        buf, pos = self._buffer, 0
+        while not self._finished:
+            pos = self._skip(buf, pos, "," if self._started else "")
+            if pos == len(buf):
+                break
+            if not self._started:
+                if buf[pos] != "[":
+                    raise ValueError("Expecting a JSON array")
+                self._started = True
+                pos += 1
+                continue
+            if buf[pos] == "]":
+                self._finished = True
+                pos += 1
+                break
+            try:
+                item, end = self._decoder.raw_decode(buf, pos)
+            except ValueError:
+                if final:
+                    raise
+                break
+            # a number could continue in the next chunk
+            if end == len(buf) and not final:
+                break
+            items.append(item)
+            pos = end
+        self._buffer = buf[pos:]
+        return items
+
+    def close(self):
+        """Flush the parser, raising ValueError for a truncated array."""
+        items = self.feed(b"", final=True)
+        if not self._finished:
+            raise ValueError("Unterminated JSON array")
+        return items
+
+    @staticmethod
+    def _skip(buf, pos, separators):
+        while pos < len(buf) and (
+            buf[pos] in _WHITESPACE or buf[pos] in separators
+        ):
+            pos += 1
+        return pos
+
+
+def iter_array(chunks):
+    """Yield the items of a JSON array read from an iterable of bytes."""
+    parser = ArrayParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
@@ -0,0 +1,104 @@
+"""
+This module keeps a local station catalog up to date.
+"""
+import logging
+import time
+
+
+log = logging.getLogger("pyradios")
+
+
+class CatalogSync:
+    """Apply the changes of the `Radio Browser` catalog to a local copy.
+
+    The first sync downloads all stations. Later syncs only request the
+    changes made since the last applied one (`json/stations/changed`
+    with `lastchangeuuid`) and merge them into the catalog.
+
+    The API does not publish deleted stations, so a full sync, which
+    drops the stations that are gone, runs every `full_sync_interval`
+    seconds.
+
+    Args:
+        rb (RadioBrowser): Client used to fetch the changes.
+        catalog (obj): Storage of the stations, e.g. `JSONCatalog`.
+        page_size (int, optional): Number of changes per request.
+        full_sync_interval (int, optional): Seconds between full syncs,
+            `None` disables them.
+
+    Examples:
+
+        >>> from pyradios import RadioBrowser
+        >>> from pyradios.catalog import JSONCatalog
+        >>> from pyradios.sync import CatalogSync
+        >>> sync = CatalogSync(RadioBrowser(), JSONCatalog('stations.json'))
+        >>> sync.sync()
+        {'inserted': 12, 'updated': 40, 'deleted': 0}
+    """
+
+    def __init__(
+        self, rb, catalog, page_size=10000, full_sync_interval=7 * 24 * 3600
+    ):
+        self.rb = rb
+        self.catalog = catalog
+        self.page_size = page_size
+        self.full_sync_interval = full_sync_interval
+
+    def _needs_full_sync(self):
+        state = self.catalog.state
+        if not state.get("lastchangeuuid") or len(self.catalog) == 0:
+            return True
+        if self.full_sync_interval is None:
+            return False
+        last = state.get("full_sync_time", 0)
+        return last + self.full_sync_interval < time.time()
+
+    def sync(self):
+        """Bring the catalog up to date.
+
+        Returns:
+            dict: Number of inserted, updated and deleted stations.
+        """
+        if self._needs_full_sync():
+            return self.full_sync()
+
+        inserted = updated = 0
+        last = self.catalog.state["lastchangeuuid"]
+        while True:
+            changes = self.rb.stations_changed(
+                lastchangeuuid=last, limit=self.page_size, fmt="json"
+            )
+            if not changes:
+                break
+            i, u = self.catalog.upsert(changes)
+            inserted += i
+            updated += u
+            last = changes[-1]["changeuuid"]
+            if len(changes) < self.page_size:
+                break
+
+        self.catalog.state["lastchangeuuid"] = last
+        self.catalog.state["sync_time"] = time.time()
+        self.catalog.save()
+        log.debug("Applied %d station changes", inserted + updated)
+        return {"inserted": inserted, "updated": updated, "deleted": 0}
+
+    def full_sync(self):
+        """Download all stations and replace the catalog contents."""
+        stations = [dict(s) for s in self.rb.iter_stations()]
+        gone = self.catalog.uuids() - {s["stationuuid"] for s in stations}
+        deleted = self.catalog.delete(gone)
+        inserted, updated = self.catalog.upsert(stations)
+
+        now = time.time()
+        latest = max(
+            stations,
+            key=lambda s: s.get("lastchangetime_iso8601") or "",
+            default=None,
+        )
+        if latest is not None:
+            self.catalog.state["lastchangeuuid"] = latest["changeuuid"]
+        self.catalog.state["sync_time"] = now
+        self.catalog.state["full_sync_time"] = now
+        self.catalog.save()
+        return {"inserted": inserted, "updated": updated, "deleted": deleted}
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from functools import wraps
 
 
@@ -64,6 +65,7 @@ def bool_to_string(b):
     raise TypeError('Value must be True or False.')
 
 
+@lru_cache(maxsize=None)
 def snake_to_camel(s):
     first, *others = s.split('_')
     return ''.join([first.lower(), *map(str.title, others)])
@@ -108,11 +110,82 @@ def validate_input(types, input_data):
                 )
 
 
+def compile_validator(types):
+    """Specialize `validate_input` for one schema.
+
+    The valid arguments are accepted with a dict lookup and a type test;
+    anything else is handed to `validate_input`, which raises the error.
+
+    Args:
+        types (dict): Type of each argument, e.g. `types['search']`.
+
+    Returns:
+        callable: Taking the arguments dict, like `validate_input`.
+    """
+    plain = {k: t for k, t in types.items() if k not in ("limit", "offset")}
+    digits = frozenset(types) - frozenset(plain)
+
+    def validate(input_data):
+        for key, value in input_data.items():
+            type_ = plain.get(key)
+            if type_ is not None and isinstance(value, type_):
+                continue
+            if key in digits and (
+                type(value) is int and value >= 0 or str(value).isdigit()
+            ):
+                continue
+            validate_input(types, {key: value})
+
+    return validate
+
+
+def compile_adapter(types):
+    """Specialize `radio_browser_adapter` for one schema.
+
+    Args:
+        types (dict): Type of each argument, e.g. `types['search']`.
+
+    Returns:
+        callable: Taking the arguments dict, returning the parameters.
+    """
+    keys = {k: snake_to_camel(k) for k in types}
+
+    def adapt(kwargs):
+        params = {}
+        for key, value in kwargs.items():
+            if value is True:
+                value = "true"
+            elif value is False:
+                value = "false"
+            params[keys.get(key) or snake_to_camel(key)] = value
+        return params
+
+    return adapt
+
+
+validators = {name: compile_validator(t) for name, t in types.items()}
+
+adapters = {name: compile_adapter(t) for name, t in types.items()}
+
+
 def type_check(func):
+    """Validate and adapt the keyword arguments of a `RadioBrowser` method.
+
+    The schema of the method, `types[func.__name__]`, is compiled once.
+    Instances with a false `_validate` attribute skip the validation.
+    The response format, `fmt`, is passed on as given.
+    """
+    validate = validators[func.__name__]
+    adapt = adapters[func.__name__]
+
     @wraps(func)
     def wrapper(self, *args, **kwargs):
-        validate_input(types[func.__name__], kwargs)
-        kwargs = radio_browser_adapter(**kwargs)
+        fmt = kwargs.pop("fmt", None)
+        if getattr(self, "_validate", True):
+            validate(kwargs)
+        kwargs = adapt(kwargs)
+        if fmt is not None:
+            kwargs["fmt"] = fmt
         return func(self, *args, **kwargs)
 
     return wrapper
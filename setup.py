@@ -29,7 +29,11 @@ setup(
     license="MIT",
     packages=find_packages(exclude=["test*"]),
     install_requires=required(),
-    extras_require={'dev': required('-dev')},
+    extras_require={
+        'dev': required('-dev'),
+        'http2': ['httpx[http2]'],
+        'fast': ['orjson'],
+    },
     classifiers=[
         "Development Status :: 1 - Planning",
         "Environment :: Console",
@@ -0,0 +1,135 @@
+import asyncio
+
+import httpx
+
+from pyradios import AsyncRadioBrowser
+
+
+BASE_URL = "https://de2.api.radio-browser.info/"
+
+
+def make_rb(handler):
+    session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return AsyncRadioBrowser(session=session, base_url=BASE_URL)
+
+
+def test_async_methods_share_the_sync_surface():
+    def handler(request):
+        return httpx.Response(200, json=[{"url": str(request.url)}])
+
+    async def main():
+        async with make_rb(handler) as rb:
+            return await asyncio.gather(
+                rb.countries(),
+                rb.stations_by_tag("Jazz", limit=1),
+                rb.click_counter("some-uuid"),
+            )
+
+    countries, jazz, click = asyncio.run(main())
+    assert countries[0]["url"] == BASE_URL + "json/countries/"
+    assert jazz[0]["url"] == (
+        BASE_URL + "json/stations/search?limit=1&tag=jazz&tagExact=false"
+    )
+    assert click[0]["url"] == BASE_URL + "json/url/some-uuid"
+
+
+def test_async_base_url_discovery(mocker):
+    async def async_pick_base_url():
+        return BASE_URL
+
+    mocker.patch(
+        "pyradios.radios.async_pick_base_url", side_effect=async_pick_base_url
+    )
+    rb = make_rb(lambda request: httpx.Response(200, json=[]))
+
+    assert asyncio.run(rb.codecs()) == []
+    assert rb._base_url == BASE_URL
+
+
+def test_async_iter_search_pages_through_results():
+    stations = [{"name": str(i)} for i in range(25)]
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        offset = int(request.url.params["offset"])
+        limit = int(request.url.params["limit"])
+        return httpx.Response(200, json=stations[offset:offset + limit])
+
+    async def main():
+        async with make_rb(handler) as rb:
+            return [
+                s async for s in rb.iter_search(page_size=10, prefetch=True)
+            ]
+
+    assert asyncio.run(main()) == stations
+    assert len(requests) == 3
+
+
+def test_async_stations_by_uuids():
+    def handler(request):
+        uuids = request.url.params["uuids"].split(",")
+        return httpx.Response(200, json=[{"stationuuid": u} for u in uuids])
+
+    async def main():
+        async with make_rb(handler) as rb:
+            return await rb.stations_by_uuids(["a", "b", "c"], chunk_size=2)
+
+    stations = asyncio.run(main())
+    assert [s["stationuuid"] for s in stations] == ["a", "b", "c"]
+
+
+def test_async_gather():
+    def handler(request):
+        if request.url.path.endswith("/codecs/"):
+            return httpx.Response(404)
+        return httpx.Response(200, json=[request.url.path])
+
+    async def main():
+        async with make_rb(handler) as rb:
+            return await rb.gather([("countries",), ("codecs",)])
+
+    countries, codecs = asyncio.run(main())
+    assert countries == ["/json/countries/"]
+    assert isinstance(codecs, httpx.HTTPStatusError)
+
+
+def test_async_download_stations(tmp_path):
+    def handler(request):
+        return httpx.Response(200, text="<result></result>")
+
+    async def main():
+        async with make_rb(handler) as rb:
+            path = tmp_path / "stations.xml"
+            size = await rb.download_stations(str(path), fmt="xml")
+            return size, path.read_text()
+
+    assert asyncio.run(main()) == (17, "<result></result>")
+
+
+def test_async_failover_discovers_mirrors_on_the_event_loop(mocker):
+    async def async_cached_hosts():
+        return ["de2.api.radio-browser.info", "nl1.api.radio-browser.info"]
+
+    blocking = mocker.patch("pyradios.radios.cached_hosts")
+    mocker.patch(
+        "pyradios.radios.async_cached_hosts", side_effect=async_cached_hosts
+    )
+    hosts = []
+
+    def handler(request):
+        hosts.append(request.url.host)
+        if request.url.host.startswith("de2"):
+            return httpx.Response(503)
+        return httpx.Response(200, json=[])
+
+    session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    rb = AsyncRadioBrowser(session=session)
+    rb.client.retry.backoff_factor = 0
+    rb._base_url = BASE_URL
+
+    assert asyncio.run(rb.codecs()) == []
+    assert hosts == [
+        "de2.api.radio-browser.info", "nl1.api.radio-browser.info"
+    ]
+    blocking.assert_not_called()
@@ -1,8 +1,14 @@
+import asyncio
 import socket
+import time
 from unittest.mock import Mock
 from unittest.mock import patch
 
 import pytest
+from pyradios import base_url
+from pyradios.base_url import async_fetch_hosts
+from pyradios.base_url import cached_hosts
+from pyradios.base_url import fetch_hosts
 from pyradios.base_url import fetch_servers
 
 
@@ -39,3 +45,91 @@ def test_fetch_servers_network_failure():
             fetch_servers()
         assert issubclass(exc_info.type, (OSError,))
         assert exc_info.type == socket.gaierror
+
+
+@pytest.fixture
+def cache_file(tmp_path):
+    base_url.clear_cache()
+    yield str(tmp_path / "hosts.json")
+    base_url.clear_cache()
+
+
+def test_cached_hosts_reuses_process_cache(cache_file):
+    mock_fetch_hosts = Mock(return_value=["de1.example", "at1.example"])
+    with patch("pyradios.base_url.fetch_hosts", mock_fetch_hosts):
+        assert cached_hosts(cache_file=cache_file) == [
+            "at1.example",
+            "de1.example",
+        ]
+        cached_hosts(cache_file=cache_file)
+    assert mock_fetch_hosts.call_count == 1
+
+
+def test_cached_hosts_reads_cache_file(cache_file):
+    with patch("pyradios.base_url.fetch_hosts", Mock(return_value=["a"])):
+        cached_hosts(cache_file=cache_file)
+    base_url.clear_cache()
+
+    mock_fetch_hosts = Mock()
+    with patch("pyradios.base_url.fetch_hosts", mock_fetch_hosts):
+        assert cached_hosts(cache_file=cache_file) == ["a"]
+    mock_fetch_hosts.assert_not_called()
+
+
+def test_cached_hosts_falls_back_to_stale_file(cache_file):
+    with patch("pyradios.base_url.fetch_hosts", Mock(return_value=["a"])):
+        cached_hosts(cache_file=cache_file)
+
+    mock_fetch_hosts = Mock(side_effect=socket.gaierror)
+    with patch("pyradios.base_url.fetch_hosts", mock_fetch_hosts):
+        assert cached_hosts(cache_file=cache_file, refresh=True) == ["a"]
+
+
+def slow_gethostbyaddr(ip):
+    if ip == "192.168.1.4":
+        time.sleep(1)
+    return "host-{}".format(ip.rsplit(".", 1)[1]), [], [ip]
+
+
+def test_fetch_hosts_drops_slow_lookups():
+    with patch("socket.getaddrinfo", getaddrinfo), patch(
+        "socket.gethostbyaddr", slow_gethostbyaddr
+    ):
+        start = time.monotonic()
+        hosts = fetch_hosts(timeout=0.2)
+        elapsed = time.monotonic() - start
+
+    assert hosts == ["host-1", "host-2", "host-3"]
+    assert elapsed < 0.9
+
+
+def test_async_fetch_hosts_drops_slow_lookups():
+    async def loop_getaddrinfo(self, *args, **kwargs):
+        return getaddrinfo(*args, **kwargs)
+
+    with patch(
+        "asyncio.BaseEventLoop.getaddrinfo", loop_getaddrinfo
+    ), patch("socket.gethostbyaddr", slow_gethostbyaddr):
+        hosts = asyncio.run(async_fetch_hosts(timeout=5, deadline=0.2))
+
+    assert hosts == ["host-1", "host-2", "host-3"]
+
+
+def test_async_cached_hosts_shares_one_discovery(cache_file):
+    calls = []
+
+    async def async_fetch_hosts():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return ["de1.example"]
+
+    async def main():
+        return await asyncio.gather(
+            *(base_url.async_cached_hosts(cache_file=cache_file)
+              for _ in range(100))
+        )
+
+    with patch("pyradios.base_url.async_fetch_hosts", async_fetch_hosts):
+        results = asyncio.run(main())
+    assert results == [["de1.example"]] * 100
+    assert len(calls) == 1
@@ -0,0 +1,93 @@
+import time
+
+import pytest
+
+from pyradios.cache import CacheEntry
+from pyradios.cache import MemoryCache
+from pyradios.cache import ResponseCache
+from pyradios.cache import SQLiteCache
+
+
+BASE_URL = "https://de2.api.radio-browser.info/"
+
+
+@pytest.mark.parametrize(
+    "endpoint, expected",
+    [
+        ("json/countries/", 86400),
+        ("json/countries/BR", 86400),
+        ("json/stations/search", 300),
+        ("json/stations/byuuid/some-uuid", 600),
+        ("json/stations", 3600),
+        ("json/url/some-uuid", 0),
+        ("json/unknown", 0),
+    ],
+)
+def test_ttl_by_endpoint(endpoint, expected):
+    assert ResponseCache().ttl(BASE_URL + endpoint) == expected
+
+
+def test_key_ignores_params_order():
+    url = BASE_URL + "json/stations/search"
+    assert ResponseCache.key(url, {"name": "a", "limit": 1}) == (
+        ResponseCache.key(url, {"limit": 1, "name": "a"})
+    )
+
+
+def test_memory_cache_evicts_least_recently_used():
+    backend = MemoryCache(maxsize=2)
+    for key in "abc":
+        backend.set(key, CacheEntry(key, time.time() + 60))
+        backend.get("a")
+
+    assert backend.get("a") is not None
+    assert backend.get("b") is None
+    assert len(backend) == 2
+
+
+def test_memory_cache_limits_the_total_size():
+    backend = MemoryCache(maxbytes=100)
+    backend.set("a", CacheEntry("a", time.time() + 60, size=60))
+    backend.set("b", CacheEntry("b", time.time() + 60, size=30))
+    backend.set("c", CacheEntry("c", time.time() + 60, size=30))
+    backend.set("dump", CacheEntry("dump", time.time() + 60, size=101))
+
+    assert backend.get("a") is None
+    assert backend.get("dump") is None
+    assert [backend.get(k).data for k in "bc"] == ["b", "c"]
+    backend.set("b", CacheEntry("b", time.time() + 60, size=70))
+    assert backend.get("c") is not None
+
+
+def test_sqlite_cache_evicts_least_recently_used(tmp_path):
+    backend = SQLiteCache(str(tmp_path / "cache.sqlite"), maxsize=2)
+    backend.set("a", CacheEntry([{"name": "a"}], time.time() + 60))
+    time.sleep(0.01)
+    backend.set("b", CacheEntry([], time.time() + 60))
+    time.sleep(0.01)
+    backend.get("a")
+    time.sleep(0.01)
+    backend.set("c", CacheEntry([], time.time() + 60))
+
+    assert backend.get("a").data == [{"name": "a"}]
+    assert backend.get("b") is None
+    assert len(backend) == 2
+
+
+def test_response_cache_counts_hits_and_misses():
+    cache = ResponseCache()
+    url = BASE_URL + "json/codecs/"
+    key = cache.key(url, {})
+
+    assert cache.get(key) is None
+    cache.set(key, url, [{"name": "MP3"}])
+    assert cache.get(key).data == [{"name": "MP3"}]
+    assert cache.stats == {"hits": 1, "misses": 1, "revalidated": 0}
+
+
+def test_response_cache_skips_uncacheable_endpoints():
+    cache = ResponseCache()
+    url = BASE_URL + "json/url/some-uuid"
+    cache.set(cache.key(url, {}), url, {"ok": True})
+
+    assert len(cache.backend) == 0
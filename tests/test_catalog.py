@@ -0,0 +1,101 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from pyradios import RadioFacets
+from pyradios.catalog import JSONCatalog
+from pyradios.catalog import SQLiteCatalog
+from tests.test_index import STATIONS
+
+
+def with_uuids(stations):
+    return [dict(s, stationuuid=s["name"]) for s in stations]
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    catalog = SQLiteCatalog(str(tmp_path / "stations.sqlite"))
+    catalog.upsert(with_uuids(STATIONS))
+    yield catalog
+    catalog.close()
+
+
+def names(stations):
+    return [s["name"] for s in stations]
+
+
+@pytest.mark.parametrize(
+    "params, expected",
+    [
+        ({}, ["Jazz FM", "Klara", "Klara Continuo", "Musiq3"]),
+        ({"name": "KLARA"}, ["Klara", "Klara Continuo"]),
+        ({"name": "klara", "name_exact": True}, ["Klara"]),
+        ({"countrycode": "be", "language": "french"}, ["Musiq3"]),
+        ({"tag": "jazz", "tag_exact": True}, ["Jazz FM", "Musiq3"]),
+        ({"tag_list": "classical,jazz"}, ["Musiq3"]),
+        ({"bitrate_min": 128, "bitrate_max": 192}, ["Klara", "Musiq3"]),
+        ({"codec": "mp3", "hidebroken": True}, ["Jazz FM", "Klara", "Musiq3"]),
+        ({"order": "votes", "reverse": True, "limit": 2},
+         ["Jazz FM", "Klara"]),
+        ({"countrycode": "BE", "offset": 1, "limit": "1"}, ["Klara Continuo"]),
+    ],
+)
+def test_search(catalog, params, expected):
+    assert names(catalog.search(**params)) == expected
+
+
+def test_upsert_merges_and_reindexes(catalog):
+    changes = [{"stationuuid": "Klara", "tags": "opera"}]
+    assert catalog.upsert(changes) == (0, 1)
+
+    assert catalog.get("Klara")["votes"] == 50
+    assert names(catalog.search(tag="opera")) == ["Klara"]
+    assert names(catalog.search(tag="public radio")) == []
+
+
+def test_catalogs_share_the_interface(tmp_path, catalog):
+    for other in (JSONCatalog(), catalog):
+        other.upsert(with_uuids(STATIONS))
+        assert other.delete(["Klara", "missing"]) == 1
+        assert len(other) == 3
+        assert "Klara" not in other
+        assert sorted(s["name"] for s in other) == [
+            "Jazz FM",
+            "Klara Continuo",
+            "Musiq3",
+        ]
+
+
+def test_state_survives_reopening(tmp_path):
+    path = str(tmp_path / "stations.sqlite")
+    SQLiteCatalog(path).state["lastchangeuuid"] = "c1"
+
+    assert SQLiteCatalog(path).state == {"lastchangeuuid": "c1"}
+
+
+def test_facets_run_against_the_catalog(catalog):
+    rf = RadioFacets(catalog, countrycode="BE")
+
+    assert len(rf) == 3
+    assert rf.codecs == [
+        {"name": "MP3", "count": 2},
+        {"name": "AAC", "count": 1},
+    ]
+
+
+def test_threads_share_the_connection(catalog):
+    def sync(n):
+        for i in range(20):
+            catalog.upsert([{"stationuuid": "t{}-{}".format(n, i),
+                             "name": "Thread", "countrycode": "NL"}])
+            catalog.state["lastchangeuuid"] = "t{}-{}".format(n, i)
+
+    def search(n):
+        for _ in range(20):
+            catalog.search(countrycode="BE")
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(lambda f: f[0](f[1]), [
+            (sync, 0), (sync, 1), (search, 0), (search, 1)
+        ]))
+    assert len(catalog.search(countrycode="NL")) == 40
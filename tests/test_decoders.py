@@ -0,0 +1,47 @@
+import httpx
+import pytest
+
+from pyradios import RadioBrowser
+from pyradios import decoders
+from pyradios.decoders import json_decoder
+
+
+DOCUMENT = b'[{"name": "Klara", "bitrate": 128, "tags": "classical,\\u00e9"}]'
+
+
+@pytest.mark.parametrize(
+    "backend",
+    [b for b in decoders.BACKENDS if decoders._installed(b)] + [None],
+)
+def test_json_decoder(backend):
+    assert json_decoder(backend)(DOCUMENT) == [
+        {"name": "Klara", "bitrate": 128, "tags": "classical,é"}
+    ]
+
+
+def test_json_decoder_falls_back_to_the_standard_library(monkeypatch):
+    monkeypatch.setattr(decoders, "msgspec", None)
+    monkeypatch.setattr(decoders, "orjson", None)
+    assert json_decoder() is decoders.json.loads
+    with pytest.raises(ImportError):
+        json_decoder("orjson")
+    with pytest.raises(ValueError):
+        json_decoder("yaml")
+
+
+def test_radio_browser_uses_the_decoder():
+    documents = []
+
+    def decoder(content):
+        documents.append(content)
+        return [{"name": "decoded"}]
+
+    def handler(request):
+        return httpx.Response(200, content=b"[]")
+
+    session = httpx.Client(transport=httpx.MockTransport(handler))
+    rb = RadioBrowser(
+        session=session, base_url="https://example.org/", decoder=decoder
+    )
+    assert rb.search(name="klara") == [{"name": "decoded"}]
+    assert documents == [b"[]"]
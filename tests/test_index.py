@@ -0,0 +1,104 @@
+import pytest
+
+from pyradios.index import LocalStationIndex
+from pyradios.records import Station
+
+
+STATIONS = [
+    {
+        "name": "Klara",
+        "country": "Belgium",
+        "countrycode": "BE",
+        "state": "Flanders",
+        "language": "dutch",
+        "tags": "classical,public radio",
+        "codec": "MP3",
+        "bitrate": 128,
+        "votes": 50,
+        "lastcheckok": 1,
+    },
+    {
+        "name": "Klara Continuo",
+        "country": "Belgium",
+        "countrycode": "BE",
+        "state": "Flanders",
+        "language": "dutch",
+        "tags": "classical",
+        "codec": "AAC",
+        "bitrate": 64,
+        "votes": 10,
+        "lastcheckok": 0,
+    },
+    {
+        "name": "Jazz FM",
+        "country": "United Kingdom",
+        "countrycode": "GB",
+        "state": "",
+        "language": "english",
+        "tags": "jazz,smooth jazz",
+        "codec": "MP3",
+        "bitrate": 320,
+        "votes": 90,
+        "lastcheckok": 1,
+    },
+    {
+        "name": "Musiq3",
+        "country": "Belgium",
+        "countrycode": "BE",
+        "state": "Brussels",
+        "language": "french,dutch",
+        "tags": "classical,jazz",
+        "codec": "MP3",
+        "bitrate": 192,
+        "votes": 30,
+        "lastcheckok": 1,
+    },
+]
+
+
+@pytest.fixture(params=[dict, Station.from_dict], ids=["dicts", "records"])
+def index(request):
+    return LocalStationIndex(request.param(s) for s in STATIONS)
+
+
+def names(stations):
+    return [s["name"] for s in stations]
+
+
+@pytest.mark.parametrize(
+    "params, expected",
+    [
+        ({}, ["Jazz FM", "Klara", "Klara Continuo", "Musiq3"]),
+        ({"name": "klara"}, ["Klara", "Klara Continuo"]),
+        ({"name": "klara", "name_exact": True}, ["Klara"]),
+        ({"countrycode": "be", "language": "french"}, ["Musiq3"]),
+        ({"tag": "jazz"}, ["Jazz FM", "Musiq3"]),
+        ({"tag": "jazz", "tag_exact": True}, ["Jazz FM", "Musiq3"]),
+        ({"tag": "smooth", "tag_exact": True}, []),
+        ({"tag_list": "classical,jazz"}, ["Musiq3"]),
+        (
+            {"country": "belg", "state": "flanders"},
+            ["Klara", "Klara Continuo"],
+        ),
+        ({"bitrate_min": 128, "bitrate_max": 192}, ["Klara", "Musiq3"]),
+        (
+            {"codec": "mp3", "hidebroken": True},
+            ["Jazz FM", "Klara", "Musiq3"],
+        ),
+        ({"order": "votes", "reverse": True, "limit": 2},
+         ["Jazz FM", "Klara"]),
+        ({"countrycode": "BE", "offset": 1, "limit": "1"}, ["Klara Continuo"]),
+    ],
+)
+def test_search(index, params, expected):
+    assert names(index.search(**params)) == expected
+
+
+def test_search_validates_arguments(index):
+    with pytest.raises(TypeError):
+        index.search(limit=None)
+
+
+def test_random_order_returns_all_matches(index):
+    stations = index.search(countrycode="BE", order="random")
+    assert sorted(names(stations)) == ["Klara", "Klara Continuo", "Musiq3"]
@@ -0,0 +1,55 @@
+from unittest.mock import patch
+
+from pyradios.mirrors import MirrorSelector
+
+
+def test_ranked_prefers_fast_healthy_mirrors():
+    selector = MirrorSelector(hosts=["a", "b", "c"])
+    selector.record("a", 0.30)
+    selector.record("b", 0.05)
+    selector.record("c", 0.01, ok=False)
+
+    assert selector.ranked() == ["b", "a", "c"]
+
+
+def test_latency_is_exponentially_weighted():
+    selector = MirrorSelector(hosts=["a"], alpha=0.5)
+    selector.record("a", 1.0)
+    selector.record("a", 0.0)
+
+    assert selector.stats("a").latency == 0.5
+
+
+def test_best_probes_unranked_mirrors():
+    selector = MirrorSelector(hosts=["a", "b"])
+
+    def probe(host):
+        selector.record(host, {"a": 0.2, "b": 0.1}[host])
+
+    with patch.object(selector, "probe", side_effect=probe) as mock_probe:
+        assert selector.best_url() == "https://b/"
+        assert selector.best_url() == "https://b/"
+    assert mock_probe.call_count == 2
+
+
+def test_probe_all_rereads_discovered_mirrors():
+    selector = MirrorSelector()
+    discovered = [["a"], ["a", "b"]]
+
+    with patch(
+        "pyradios.mirrors.cached_hosts", side_effect=discovered
+    ), patch.object(selector, "probe") as mock_probe:
+        selector.probe_all()
+        selector.probe_all()
+    assert selector.hosts == ["a", "b"]
+    assert mock_probe.call_count == 3
+
+
+def test_probe_all_keeps_explicit_mirrors():
+    selector = MirrorSelector(hosts=["a"])
+
+    with patch("pyradios.mirrors.cached_hosts") as mock_hosts, patch.object(
+        selector, "probe"
+    ):
+        selector.probe_all()
+    mock_hosts.assert_not_called()
@@ -1,10 +1,17 @@
+import json
 import re
 
+import httpx
 import pytest
 import random
+import time
 
 from pyradios import RadioBrowser
+from pyradios import RadioFacets
+from pyradios.catalog import JSONCatalog
 from pyradios.radios import version
+from pyradios.records import Station
+from pyradios.sync import CatalogSync
 
 
 BASE_URL = "https://de2.api.radio-browser.info/"
@@ -26,6 +33,18 @@ def rb():
     return _rb
 
 
+def test_base_url_is_resolved_lazily(mocker):
+    pick_base_url = mocker.patch(
+        "pyradios.radios.pick_base_url", return_value=BASE_URL
+    )
+    _rb = RadioBrowser()
+    pick_base_url.assert_not_called()
+
+    assert _rb.base_url == BASE_URL
+    assert _rb.base_url == BASE_URL
+    pick_base_url.assert_called_once()
+
+
 def test_request_station_click_counter(rb, mocker):
     expected = {
         "ok": True,
@@ -148,3 +167,226 @@ def test_request_station_tag_list(rb):
         assert (
             len(missing_tokens) == 0
         ), "tokens missing %s in result-tag %s" % (missing_tokens, tagtokens)
+
+
+def fake_pages(total):
+    stations = [{"name": str(i)} for i in range(total)]
+
+    def fetch(url, params, cache=True):
+        assert cache is False, "pages must bypass the response cache"
+        offset, limit = params["offset"], params["limit"]
+        return stations[offset:offset + limit]
+
+    return fetch
+
+
+@pytest.mark.parametrize("prefetch", [False, True])
+def test_iter_search_pages_through_results(rb, mocker, prefetch):
+    fetch = mocker.patch.object(
+        rb.client, "fetch", side_effect=fake_pages(25)
+    )
+    stations = rb.iter_search(
+        tag="Jazz", page_size=10, prefetch=prefetch
+    )
+
+    assert [s["name"] for s in stations] == [str(i) for i in range(25)]
+    assert fetch.call_count == 3
+    url, params = fetch.call_args.args
+    assert url == BASE_URL + "json/stations/search"
+    assert params == {"tag": "jazz", "offset": 20, "limit": 10}
+
+
+def test_iter_stations_honours_offset_and_limit(rb, mocker):
+    fetch = mocker.patch.object(
+        rb.client, "fetch", side_effect=fake_pages(100)
+    )
+    stations = list(rb.iter_stations(page_size=10, offset=5, limit=15))
+
+    assert [s["name"] for s in stations] == [str(i) for i in range(5, 20)]
+    assert [c.args[1]["limit"] for c in fetch.call_args_list] == [10, 5]
+
+
+def test_stream_search_parses_the_response_incrementally():
+    stations = [{"name": str(i)} for i in range(50)]
+    body = json.dumps(stations).encode("utf-8")
+
+    def handler(request):
+        assert request.url.params["tag"] == "jazz"
+        return httpx.Response(200, stream=ChunkedStream(body, 16))
+
+    session = httpx.Client(transport=httpx.MockTransport(handler))
+    _rb = RadioBrowser(session=session, base_url=BASE_URL)
+
+    assert list(_rb.stream_search(tag="Jazz")) == stations
+
+
+class ChunkedStream(httpx.SyncByteStream):
+    def __init__(self, data, size):
+        self.data = data
+        self.size = size
+
+    def __iter__(self):
+        for i in range(0, len(self.data), self.size):
+            yield self.data[i:i + self.size]
+
+
+def test_records_mode_returns_station_records(mocker):
+    _rb = RadioBrowser(base_url=BASE_URL, records=True)
+    mocker.patch.object(
+        _rb.client, "get", return_value=[{"name": "Klara", "tags": "a,b"}]
+    )
+
+    station, = _rb.search(name="klara")
+    assert isinstance(station, Station)
+    assert station.tags == ("a", "b")
+
+
+def test_stations_by_uuids_keeps_input_order(rb, mocker):
+    def get(url, uuids):
+        assert url == BASE_URL + "json/stations/byuuid"
+        return [{"stationuuid": u} for u in uuids.split(",") if u != "x"]
+
+    client_get = mocker.patch.object(rb.client, "get", side_effect=get)
+    uuids = ["c", "x", "a", "b", "a", "d", "e"]
+
+    stations = rb.stations_by_uuids(uuids, chunk_size=2)
+
+    assert [s and s["stationuuid"] for s in stations] == [
+        "c", None, "a", "b", "a", "d", "e"
+    ]
+    assert client_get.call_count == 3
+
+
+def test_gather_returns_results_and_errors_in_order(rb, mocker):
+    def get(url, **params):
+        if url.endswith("topvote/2"):
+            raise httpx.ConnectError("boom")
+        return [url[len(BASE_URL):]]
+
+    mocker.patch.object(rb.client, "get", side_effect=get)
+
+    countries, jazz, votes, codecs = rb.gather(
+        [
+            ("countries",),
+            ("stations_by_tag", "jazz", {"limit": 10}),
+            ("stations_by_votes", 2),
+            lambda: rb.codecs(),
+        ],
+        max_concurrency=2,
+    )
+
+    assert countries == ["json/countries/"]
+    assert jazz == ["json/stations/search"]
+    assert isinstance(votes, httpx.ConnectError)
+    assert codecs == ["json/codecs/"]
+
+
+def test_responses_in_other_formats_are_text():
+    paths = []
+
+    def handler(request):
+        paths.append(request.url.path)
+        if request.url.path.startswith("/json/"):
+            return httpx.Response(200, json=[])
+        return httpx.Response(200, text="name,stationcount\nBE,12\n")
+
+    session = httpx.Client(transport=httpx.MockTransport(handler))
+    _rb = RadioBrowser(session=session, base_url=BASE_URL, fmt="csv")
+
+    assert _rb.countrycodes() == "name,stationcount\nBE,12\n"
+    assert _rb.stations_by_uuids(["a"]) == [None]
+    assert paths == ["/csv/countrycodes/", "/json/stations/byuuid"]
+
+    with pytest.raises(ValueError):
+        RadioBrowser(fmt="yaml")
+
+
+def test_format_can_be_chosen_per_call():
+    paths = []
+
+    def handler(request):
+        paths.append(request.url.path)
+        if request.url.path.startswith("/json/"):
+            return httpx.Response(200, json=[{"name": "BE"}])
+        return httpx.Response(200, text="name\nBE\n")
+
+    session = httpx.Client(transport=httpx.MockTransport(handler))
+    _rb = RadioBrowser(session=session, base_url=BASE_URL, fmt="csv")
+
+    assert _rb.search(name="klara", fmt="xml") == "name\nBE\n"
+    assert _rb.countries(fmt="json") == [{"name": "BE"}]
+    assert _rb.stations(fmt="m3u") == "name\nBE\n"
+    assert _rb.click_counter("uuid") == [{"name": "BE"}]
+    assert paths == [
+        "/xml/stations/search", "/json/countries/", "/m3u/stations",
+        "/json/url/uuid",
+    ]
+    with pytest.raises(ValueError):
+        _rb.tags(fmt="yaml")
+
+
+def test_facets_and_sync_read_json_from_a_csv_client():
+    def handler(request):
+        if not request.url.path.startswith("/json/"):
+            return httpx.Response(200, text="not json")
+        if request.url.path == "/json/tags/":
+            return httpx.Response(
+                200, json=[{"name": "jazz", "stationcount": 1}]
+            )
+        return httpx.Response(200, json=[dict(
+            name="Jazz FM", tags="jazz", countrycode="GB", language="",
+            state="", codec="MP3", stationuuid="a", changeuuid="c1",
+        )])
+
+    session = httpx.Client(transport=httpx.MockTransport(handler))
+    _rb = RadioBrowser(session=session, base_url=BASE_URL, fmt="csv")
+
+    rf = RadioFacets(_rb)
+    assert rf.tags == [{"name": "jazz", "count": 1}]
+    assert len(rf.narrow(countrycode="GB")) == 1
+
+    catalog = JSONCatalog()
+    catalog.upsert([{"stationuuid": "a"}])
+    catalog.state.update(lastchangeuuid="c0", full_sync_time=time.time())
+    assert CatalogSync(_rb, catalog).sync()["updated"] == 1
+
+
+def test_download_stations_streams_to_disk(tmp_path):
+    body = b"#EXTM3U\n" + b"#EXTINF:1,Station\nhttp://a.test/\n" * 1000
+    urls = []
+
+    def handler(request):
+        urls.append(request.url)
+        return httpx.Response(200, stream=ChunkedStream(body, 1024))
+
+    session = httpx.Client(transport=httpx.MockTransport(handler))
+    _rb = RadioBrowser(session=session, base_url=BASE_URL)
+    path = tmp_path / "jazz.m3u"
+
+    assert _rb.download_stations(str(path), fmt="m3u", tag="Jazz") == len(
+        body
+    )
+    assert path.read_bytes() == body
+    assert urls[0].path == "/m3u/stations/search"
+    assert urls[0].params["tag"] == "jazz"
+
+    _rb.download_stations(str(tmp_path / "all.csv"))
+    assert urls[1].path == "/csv/stations"
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "all.csv", "jazz.m3u"
+    ]
+
+
+def test_failed_download_keeps_the_previous_file(tmp_path):
+    def handler(request):
+        return httpx.Response(503)
+
+    session = httpx.Client(transport=httpx.MockTransport(handler))
+    _rb = RadioBrowser(session=session, base_url=BASE_URL)
+    path = tmp_path / "stations.xml"
+    path.write_text("previous")
+
+    with pytest.raises(httpx.HTTPStatusError):
+        _rb.download_stations(str(path), fmt="xml")
+    assert path.read_text() == "previous"
+    assert [p.name for p in tmp_path.iterdir()] == ["stations.xml"]
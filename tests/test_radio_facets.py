@@ -1,12 +1,16 @@
+import httpx
 import pytest
 import sys
 import logging
 import random
 import os
 from functools import reduce
+from unittest.mock import Mock
 
 
 from pyradios import RadioBrowser, RadioFacets
+from pyradios.facets import facet_histogram
+from pyradios.records import Station
 
 
 log = logging.getLogger("pyradios")
@@ -107,6 +111,190 @@ def test_facet_narrow_broaden(rb):
               f"matching {rfklaraclss.filter}")
 
 
+def test_narrow_and_broaden_reuse_fetched_stations():
+    stations = [
+        dict(name="klara", tags="classical", countrycode="BE",
+             language="dutch", state="", codec="MP3"),
+        dict(name="musiq3", tags="classical,jazz", countrycode="BE",
+             language="french", state="", codec="MP3"),
+        dict(name="jazz fm", tags="jazz", countrycode="GB",
+             language="english", state="", codec="AAC"),
+    ]
+    rb = Mock(spec=["search"])
+    rb.search.return_value = stations
+
+    rf = RadioFacets(rb)
+    assert len(rf) == 3
+    rfjazz = rf.narrow(tag="jazz")
+    rfjazzbe = rfjazz.narrow(countrycode="BE")
+
+    assert [s["name"] for s in rfjazz.result] == ["jazz fm", "musiq3"]
+    assert [s["name"] for s in rfjazzbe.result] == ["musiq3"]
+    assert rfjazzbe.languages == [{"name": "french", "count": 1}]
+    assert rfjazzbe.broaden("countrycode") is rfjazz
+    assert rfjazzbe.broaden(tag="jazz", countrycode="BE") is rf
+    rb.search.assert_called_once_with()
+
+    # a limited result set is incomplete, narrowing it needs the service
+    rf.narrow(limit=1).narrow(tag="jazz").result
+    assert rb.search.call_count == 2
+
+
+def test_narrow_with_an_exact_flag_filters_locally():
+    stations = [
+        dict(name="Klara", tags="classical", countrycode="BE",
+             language="dutch", state="", codec="MP3"),
+        dict(name="Klara Continuo", tags="classical", countrycode="BE",
+             language="dutch", state="", codec="AAC"),
+    ]
+    rb = Mock(spec=["search"])
+    rb.search.return_value = stations
+
+    rf = RadioFacets(rb, name="Klara")
+    assert len(rf) == 2
+    rf = rf.narrow(name_exact=True)
+    assert [s["name"] for s in rf.result] == ["Klara"]
+    rb.search.assert_called_once_with(name="Klara")
+
+
+@pytest.mark.parametrize("make", [dict, Station.from_dict])
+def test_facet_histogram(make):
+    stations = [
+        make(dict(tags="jazz,pop")),
+        make(dict(tags="")),
+        make(dict(tags="pop")),
+        make(dict(tags="rock,pop")),
+        make(dict(tags="jazz")),
+    ]
+    assert facet_histogram(stations, "tags") == [
+        ("pop", 3), ("jazz", 2), ("", 1), ("rock", 1)
+    ]
+    assert facet_histogram(stations, "tags", top=2) == [
+        ("pop", 3), ("jazz", 2)
+    ]
+
+
+def test_facets_are_computed_on_first_access(mocker):
+    stations = [
+        dict(tags="jazz", codec="MP3", bitrate=128),
+        dict(tags="jazz,pop", codec="AAC", bitrate=64),
+        dict(tags="", codec="MP3", bitrate=0),
+        dict(tags="pop", codec="MP3", bitrate=320),
+    ]
+    rb = Mock(spec=["search"])
+    rb.search.return_value = stations
+    histogram = mocker.spy(
+        sys.modules["pyradios.facets"], "facet_histogram"
+    )
+
+    rf = RadioFacets(rb, facets=["tags", "codec", "bitrate"])
+    assert histogram.call_count == 0
+    assert rf.tags == [
+        {"name": "jazz", "count": 2},
+        {"name": "pop", "count": 2},
+        {"name": "", "count": 1},
+    ]
+    assert rf.tags is rf.tags
+    assert histogram.call_count == 1
+    assert rf.bitrates == [
+        {"name": "0-63", "count": 1},
+        {"name": "64-95", "count": 1},
+        {"name": "128-191", "count": 1},
+        {"name": "320+", "count": 1},
+    ]
+    with pytest.raises(AttributeError):
+        rf.languages
+
+    # the facets mapping computes its entries on lookup too
+    assert rf.facets["codecs"] == [
+        {"name": "MP3", "count": 3}, {"name": "AAC", "count": 1}
+    ]
+    assert list(rf.facets) == ["tags", "codecs", "bitrates"]
+    assert dict(rf.facets)["tags"] is rf.tags
+    with pytest.raises(KeyError):
+        rf.facets["languages"]
+
+    # derived facets keep the configured fields
+    assert rf.narrow(codec="MP3").codecs == [{"name": "MP3", "count": 3}]
+    assert len(rf.narrow(limit=1).bitrates) == 1
+
+
+def test_unfiltered_facets_use_aggregate_endpoints():
+    aggregates = {
+        "/json/tags/": [
+            {"name": "pop", "stationcount": 5},
+            {"name": "jazz", "stationcount": 9},
+        ],
+        "/json/states/": [
+            {"name": "Limburg", "country": "Belgium", "stationcount": 2},
+            {"name": "Limburg", "country": "Netherlands", "stationcount": 3},
+            {"name": "Flanders", "country": "Belgium", "stationcount": 4},
+        ],
+    }
+    paths = []
+
+    def handler(request):
+        paths.append(request.url.path)
+        if request.url.path in aggregates:
+            return httpx.Response(200, json=aggregates[request.url.path])
+        return httpx.Response(200, json=[dict(
+            tags="rock", countrycode="BE", language="", state="Limburg",
+            codec="MP3", bitrate=128,
+        )])
+
+    session = httpx.Client(transport=httpx.MockTransport(handler))
+    rb = RadioBrowser(session=session, base_url="https://example.org/")
+
+    rf = RadioFacets(rb, order="votes", facets=["tags", "state", "bitrate"])
+    # the counting does not depend on the stations being fetched first
+    assert len(rf) == 1
+    assert rf.tags == [
+        {"name": "jazz", "count": 9},
+        {"name": "pop", "count": 5},
+    ]
+    assert rf.states == [
+        {"name": "Limburg", "count": 5},
+        {"name": "Flanders", "count": 4},
+    ]
+    assert paths == [
+        "/json/stations/search", "/json/tags/", "/json/states/"
+    ]
+
+    # numeric facets and filtered queries need the stations
+    assert rf.bitrates == [{"name": "128-191", "count": 1}]
+    assert rf.narrow(limit=10).tags == [{"name": "rock", "count": 1}]
+    assert len(paths) == 3
+
+
+def test_narrowing_an_unfetched_root_filters_on_the_service():
+    requests = []
+
+    def handler(request):
+        requests.append(request.url)
+        if request.url.path == "/json/tags/":
+            return httpx.Response(
+                200, json=[{"name": "jazz", "stationcount": 3}]
+            )
+        return httpx.Response(200, json=[dict(
+            tags="jazz", countrycode="NL", language="dutch", state="",
+            codec="MP3",
+        )])
+
+    session = httpx.Client(transport=httpx.MockTransport(handler))
+    rb = RadioBrowser(session=session, base_url="https://example.org/")
+
+    rf = RadioFacets(rb)
+    assert rf.tags == [{"name": "jazz", "count": 3}]
+    rfnl = rf.narrow(countrycode="NL")
+    assert len(rfnl) == 1
+
+    assert [u.path for u in requests] == [
+        "/json/tags/", "/json/stations/search"
+    ]
+    assert requests[1].params["countrycode"] == "NL"
+    assert rf._result is None, "the unfiltered stations are not fetched"
+
+
 def enable_stdout_logging():
     if 'PYTEST_LOG' in os.environ:
         loglevel = logging.getLevelName(os.environ['PYTEST_LOG'].upper())
@@ -0,0 +1,52 @@
+import sys
+
+from pyradios.records import Country
+from pyradios.records import Station
+from pyradios.records import record_type
+from pyradios.records import to_records
+
+
+STATION = {
+    "stationuuid": "96062a7b-0601-11e8-ae97-52543be04c81",
+    "name": "BBC Radio 1",
+    "tags": "bbc,indie,entertainment",
+    "countrycode": "GB",
+    "codec": "MP3",
+    "bitrate": 128,
+    "unknown": "dropped",
+}
+
+
+def test_station_record():
+    station = Station.from_dict(STATION)
+
+    assert station.name == "BBC Radio 1"
+    assert station.tags == ("bbc", "indie", "entertainment")
+    assert station["tags"] == "bbc,indie,entertainment"
+    assert station.get("state") is None
+    assert station.get("unknown", "default") == "default"
+    assert not hasattr(station, "__dict__")
+
+
+def test_repeated_values_are_interned():
+    code = "".join(["G", "B"])
+    first = Station.from_dict(STATION)
+    second = Station.from_dict(dict(STATION, countrycode=code))
+
+    assert second.countrycode is first.countrycode
+    assert first.countrycode is sys.intern("GB")
+
+
+def test_to_dict_round_trip():
+    station = Station.from_dict(STATION)
+    assert Station.from_dict(station.to_dict()) == station
+
+
+def test_records_by_endpoint():
+    assert record_type("json/stations/search") is Station
+    assert record_type("json/countries/BR") is Country
+    assert record_type("json/url/some-uuid") is None
+    assert to_records("json/states/", [{"name": "a"}]) == [{"name": "a"}]
+    assert to_records("json/countries/", [{"name": "Brazil"}]) == [
+        Country(name="Brazil")
+    ]
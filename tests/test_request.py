@@ -0,0 +1,165 @@
+import httpx
+import pytest
+
+from pyradios.cache import ResponseCache
+from pyradios.radios import RadioBrowser
+from pyradios.radios import Request
+from pyradios.retry import RetryPolicy
+
+
+def make_request(handler, **kwargs):
+    session = httpx.Client(transport=httpx.MockTransport(handler))
+    kwargs.setdefault("retry", RetryPolicy(backoff_factor=0))
+    return Request(session=session, **kwargs)
+
+
+def test_get_fails_over_to_next_mirror(mocker):
+    mocker.patch(
+        "pyradios.radios.cached_hosts", return_value=["a.test", "b.test"]
+    )
+    hosts = []
+
+    def handler(request):
+        hosts.append(request.url.host)
+        if request.url.host == "a.test":
+            return httpx.Response(503)
+        return httpx.Response(200, json=[{"name": "MP3"}])
+
+    client = make_request(handler)
+    assert client.get("https://a.test/json/codecs/") == [{"name": "MP3"}]
+    assert hosts == ["a.test", "b.test"]
+    assert client.stats == {"requests": 1, "retries": 1, "failovers": 1}
+
+
+def test_explicit_base_url_disables_mirror_discovery(mocker):
+    discovery = mocker.patch("pyradios.radios.cached_hosts")
+
+    def handler(request):
+        return httpx.Response(503)
+
+    session = httpx.Client(transport=httpx.MockTransport(handler))
+    rb = RadioBrowser(
+        session=session,
+        base_url="https://a.test/",
+        retry=RetryPolicy(backoff_factor=0),
+    )
+    with pytest.raises(httpx.HTTPStatusError):
+        rb.codecs()
+    assert rb.client.stats["retries"] == 2
+    discovery.assert_not_called()
+
+
+def test_get_retries_connection_errors(mocker):
+    mocker.patch("pyradios.radios.cached_hosts", return_value=["a.test"])
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            raise httpx.ConnectError("connection reset", request=request)
+        return httpx.Response(200, json=[])
+
+    client = make_request(handler)
+    assert client.get("https://a.test/json/codecs/") == []
+    assert client.stats == {"requests": 1, "retries": 1, "failovers": 0}
+
+
+def test_get_does_not_retry_client_errors():
+    client = make_request(lambda request: httpx.Response(404))
+
+    with pytest.raises(httpx.HTTPStatusError):
+        client.get("https://a.test/json/codecs/")
+    assert client.stats["retries"] == 0
+
+
+def test_get_gives_up_after_total_retries(mocker):
+    mocker.patch("pyradios.radios.cached_hosts", return_value=["a.test"])
+    client = make_request(
+        lambda request: httpx.Response(500),
+        retry=RetryPolicy(total=2, backoff_factor=0),
+    )
+
+    with pytest.raises(httpx.HTTPStatusError):
+        client.get("https://a.test/json/codecs/")
+    assert client.stats["retries"] == 2
+
+
+def test_radio_browser_configures_the_connection_pool(mocker):
+    client = mocker.spy(httpx, "Client")
+    RadioBrowser(
+        timeout=3.0,
+        connect_timeout=1.0,
+        max_connections=8,
+        max_keepalive_connections=4,
+        keepalive_expiry=30.0,
+    )
+
+    client.assert_called_once_with(
+        timeout=httpx.Timeout(3.0, connect=1.0),
+        limits=httpx.Limits(
+            max_connections=8,
+            max_keepalive_connections=4,
+            keepalive_expiry=30.0,
+        ),
+        http2=False,
+    )
+
+
+def test_get_serves_repeated_calls_from_cache():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200, json=[{"name": "MP3"}])
+
+    client = make_request(handler, cache=ResponseCache())
+    for _ in range(2):
+        client.get("https://a.test/json/codecs/", hidebroken="true")
+
+    assert len(calls) == 1
+    assert client.cache.stats["hits"] == 1
+
+
+def test_random_order_is_never_cached():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200, json=[])
+
+    client = make_request(handler, cache=ResponseCache())
+    for _ in range(2):
+        client.get("https://a.test/json/stations/search", order="random")
+
+    assert len(calls) == 2
+    assert client.cache.stats["hits"] == 0
+
+
+def test_radio_browser_does_not_cache_by_default():
+    assert RadioBrowser().client.cache is None
+    assert RadioBrowser(cache=True).client.cache is not None
+
+
+def test_get_revalidates_expired_entries():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304, headers={"ETag": '"v1"'})
+        return httpx.Response(
+            200, json=[{"name": "jazz"}], headers={"ETag": '"v1"'}
+        )
+
+    cache = ResponseCache()
+    client = make_request(handler, cache=cache)
+    url = "https://a.test/json/tags/"
+
+    assert client.get(url) == [{"name": "jazz"}]
+    cache.backend.get(url).expires = 0
+    assert client.get(url) == [{"name": "jazz"}]
+
+    assert "If-None-Match" not in requests[0].headers
+    assert requests[1].headers["If-None-Match"] == '"v1"'
+    assert cache.get(url).fresh()
+    assert cache.stats["revalidated"] == 1
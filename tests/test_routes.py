@@ -0,0 +1,33 @@
+import httpx
+
+from pyradios.routes import Router
+
+
+URL = "https://de1.api.radio-browser.info/json/stations/search"
+
+
+def test_url_encodes_params_like_httpx():
+    params = {"tagList": "rock & roll", "limit": 10, "reverse": "true"}
+    assert Router().url(URL, params) == httpx.URL(URL, params=params)
+    assert Router().url(URL) == httpx.URL(URL)
+
+
+def test_repeated_calls_reuse_the_url():
+    router = Router()
+    url = router.url(URL, {"tag": "jazz", "limit": 10})
+    assert router.url(URL, {"tag": "jazz", "limit": 10}) is url
+    assert router.url(URL, {"tag": "jazz", "limit": 20}) is not url
+    assert router.url(URL) is router.url(URL)
+
+
+def test_unhashable_params_are_not_cached():
+    url = Router().url(URL, {"tag": ["jazz", "blues"]})
+    assert url.params.get_list("tag") == ["jazz", "blues"]
+
+
+def test_least_recently_used_urls_are_dropped():
+    router = Router(maxsize=2)
+    first = router.url(URL, {"offset": 0})
+    router.url(URL, {"offset": 1})
+    router.url(URL, {"offset": 2})
+    assert router.url(URL, {"offset": 0}) is not first
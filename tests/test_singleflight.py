@@ -0,0 +1,66 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from pyradios.singleflight import AsyncSingleFlight
+from pyradios.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return ["result"]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [executor.submit(flight.do, "key", fetch) for _ in range(8)]
+        started.wait(5)
+        time.sleep(0.2)  # let the other callers join the flight
+        release.set()
+        results = [f.result() for f in futures]
+
+    assert calls == [1]
+    assert results == [["result"]] * 8
+    # every caller can modify its own list
+    assert len({id(r) for r in results}) == 8
+
+
+def test_errors_are_shared_and_not_cached():
+    flight = SingleFlight()
+
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        flight.do("key", fail)
+    assert flight.do("key", lambda: "ok") == "ok"
+
+
+def test_async_concurrent_calls_share_one_execution():
+    flight = AsyncSingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return ["result"]
+
+    async def main():
+        return await asyncio.gather(
+            *(flight.do("key", fetch) for _ in range(8))
+        )
+
+    results = asyncio.run(main())
+    assert calls == [1]
+    assert results == [["result"]] * 8
+    # every caller can modify its own list
+    assert len({id(r) for r in results}) == 8
@@ -0,0 +1,43 @@
+import json
+
+import pytest
+
+from pyradios.stream import ArrayParser
+from pyradios.stream import iter_array
+
+
+STATIONS = [
+    {"name": "Klara", "tags": "classical", "bitrate": 128},
+    {"name": "Radio 1 éè", "tags": "", "bitrate": 320},
+    {"name": "[,]", "tags": "a,b", "bitrate": 0},
+]
+
+
+def chunked(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("size", [1, 2, 7, 1024])
+def test_iter_array_yields_items_across_chunks(size):
+    data = json.dumps(STATIONS, indent=2).encode("utf-8")
+    assert list(iter_array(chunked(data, size))) == STATIONS
+
+
+def test_numbers_split_across_chunks():
+    assert list(iter_array([b"[12", b"3, 4", b"5]"])) == [123, 45]
+
+
+def test_empty_array():
+    assert list(iter_array([b" [ ", b"] "])) == []
+
+
+def test_items_are_returned_as_soon_as_complete():
+    parser = ArrayParser()
+    assert parser.feed(b'[{"a": 1}, {"b"') == [{"a": 1}]
+    assert parser.feed(b': 2}]') == [{"b": 2}]
+
+
+@pytest.mark.parametrize("data", [b'{"a": 1}', b'[{"a": 1}, {"b"'])
+def test_invalid_or_truncated_arrays(data):
+    with pytest.raises(ValueError):
+        list(iter_array([data]))
@@ -0,0 +1,69 @@
+from unittest.mock import Mock
+
+from pyradios.catalog import JSONCatalog
+from pyradios.sync import CatalogSync
+
+
+def station(uuid, change, name, time="2024-01-01 00:00:00"):
+    return {
+        "stationuuid": uuid,
+        "changeuuid": change,
+        "name": name,
+        "votes": 1,
+        "lastchangetime_iso8601": time,
+    }
+
+
+def test_first_sync_downloads_everything(tmp_path):
+    rb = Mock()
+    rb.iter_stations.return_value = iter(
+        [station("a", "c1", "A"), station("b", "c2", "B", "2024-02-01")]
+    )
+    catalog = JSONCatalog(str(tmp_path / "stations.json"))
+
+    result = CatalogSync(rb, catalog).sync()
+
+    assert result == {"inserted": 2, "updated": 0, "deleted": 0}
+    assert catalog.state["lastchangeuuid"] == "c2"
+    assert len(JSONCatalog(catalog.path)) == 2
+    rb.stations_changed.assert_not_called()
+
+
+def test_later_syncs_only_fetch_changes(tmp_path):
+    catalog = JSONCatalog(str(tmp_path / "stations.json"))
+    catalog.upsert([station("a", "c1", "A")])
+    catalog.state.update(lastchangeuuid="c1", full_sync_time=1e12)
+
+    rb = Mock()
+    rb.stations_changed.side_effect = [
+        [
+            {"stationuuid": "a", "changeuuid": "c3", "name": "A2"},
+            station("b", "c4", "B"),
+        ],
+        [station("c", "c5", "C")],
+    ]
+
+    result = CatalogSync(rb, catalog, page_size=2).sync()
+
+    assert result == {"inserted": 2, "updated": 1, "deleted": 0}
+    assert catalog.get("a")["name"] == "A2"
+    assert catalog.get("a")["votes"] == 1, "unchanged fields are kept"
+    assert catalog.state["lastchangeuuid"] == "c5"
+    assert [c.kwargs for c in rb.stations_changed.call_args_list] == [
+        {"lastchangeuuid": "c1", "limit": 2, "fmt": "json"},
+        {"lastchangeuuid": "c4", "limit": 2, "fmt": "json"},
+    ]
+    rb.iter_stations.assert_not_called()
+
+
+def test_full_sync_drops_deleted_stations():
+    catalog = JSONCatalog()
+    catalog.upsert([station("a", "c1", "A"), station("gone", "c2", "G")])
+
+    rb = Mock()
+    rb.iter_stations.return_value = iter([station("a", "c1", "A")])
+
+    result = CatalogSync(rb, catalog).full_sync()
+
+    assert result == {"inserted": 0, "updated": 1, "deleted": 1}
+    assert "gone" not in catalog
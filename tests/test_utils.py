@@ -2,6 +2,10 @@ import pytest
 
 from pyradios.utils import types
 from pyradios.utils import bool_to_string
+from pyradios.utils import compile_adapter
+from pyradios.utils import compile_validator
+from pyradios.utils import radio_browser_adapter
+from pyradios.utils import type_check
 from pyradios.utils import validate_input
 
 
@@ -53,3 +57,55 @@ def test_validate_input_with_invalid_limit_and_offset(input_data, expected):
     assert str(exc.value) == 'Argument {!r} must be {}, not {}'.format(
         *expected
     )
+
+
+def outcome(validate, input_data):
+    try:
+        validate(input_data)
+    except Exception as exc:
+        return type(exc), str(exc)
+
+
+@pytest.mark.parametrize(
+    'input_data',
+    [
+        {},
+        {'name': 'klara', 'name_exact': True, 'limit': 10, 'offset': '0'},
+        {'bitrate_min': 64, 'reverse': False},
+        {'limit': 10, 'offset': 'a'},
+        {'limit': -1},
+        {'offset': True, 'limit': None},
+        {'name': 1},
+        {'reverse': 'true'},
+        {'unknown': 1},
+    ],
+)
+def test_compile_validator_matches_validate_input(input_data):
+    validate = compile_validator(types['search'])
+    assert outcome(validate, input_data) == outcome(
+        lambda data: validate_input(types['search'], data), input_data
+    )
+
+
+def test_compile_adapter_matches_radio_browser_adapter():
+    kwargs = {'tag_list': 'jazz', 'name_exact': True, 'hidebroken': False,
+              'limit': 10, 'not_in_schema': 'x'}
+    adapt = compile_adapter(types['search'])
+    assert adapt(kwargs) == radio_browser_adapter(**kwargs) == {
+        'tagList': 'jazz', 'nameExact': 'true', 'hidebroken': 'false',
+        'limit': 10, 'notInSchema': 'x'}
+
+
+def test_type_check_can_skip_validation():
+    class Service:
+        def __init__(self, validate):
+            self._validate = validate
+
+        @type_check
+        def search(self, **kwargs):
+            return kwargs
+
+    with pytest.raises(TypeError):
+        Service(validate=True).search(name_exact='yes')
+    assert Service(validate=False).search(name_exact='yes') == {
+        'nameExact': 'yes'}